@@ -3,14 +3,38 @@
 Fix IDs 1-12 in historical-data.json to use same single-line format as IDs 23-24
 """
 
-import json
+try:
+    import orjson
+except ImportError:  # stdlib fallback when orjson isn't installed
+    orjson = None
+    import json
+
+DATA_FILE = 'hooks/dashboard-data/historical-data.json'
+
+# Odd IDs: Rental Value (same as ID 23)
+RENTAL_VALUE_TPL = "SELECT SUM(il.extended_price) AS RentalValue_Month{month} FROM oe_hdr oh JOIN invoice_line il ON il.order_no = oh.order_no JOIN invoice_hdr ih ON ih.invoice_no = il.invoice_no WHERE oh.rental_billing_flag = 'U' AND ih.invoice_date >= DATEFROMPARTS( YEAR(DATEADD(month, {offset}, GETDATE())), MONTH(DATEADD(month, {offset}, GETDATE())), 1 ) AND ih.invoice_date < DATEFROMPARTS( YEAR(DATEADD(month, {next_offset}, GETDATE())), MONTH(DATEADD(month, {next_offset}, GETDATE())), 1 );"
+# Even IDs: Rental Count (same as ID 24)
+RENTAL_COUNT_TPL = "SELECT COUNT(DISTINCT oh.order_no) AS NewRentalCount_Month{month} FROM oe_hdr oh WHERE oh.rental_billing_flag = 'U' AND oh.order_date >= DATEFROMPARTS( YEAR(DATEADD(month, {offset}, GETDATE())), MONTH(DATEADD(month, {offset}, GETDATE())), 1 ) AND oh.order_date < DATEFROMPARTS( YEAR(DATEADD(month, {next_offset}, GETDATE())), MONTH(DATEADD(month, {next_offset}, GETDATE())), 1 );"
+
+def _load_json(path):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _dump_json(data, path):
+    # Encode once and write once; json.dump issues a write() per token.
+    if orjson:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
 
 def fix_first_12():
     print("🔧 Fixing IDs 1-12 in historical-data.json...")
 
     # Read the file
-    with open('hooks/dashboard-data/historical-data.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = _load_json(DATA_FILE)
 
     changes_made = 0
 
@@ -33,10 +57,8 @@ def fix_first_12():
         offset = -month        # e.g., -11 for month 11
         next_offset = offset + 1  # e.g., -10 for month 11
 
-        if id % 2 == 1:  # Odd IDs: Rental Value (same as ID 23)
-            new_sql = f"SELECT SUM(il.extended_price) AS RentalValue_Month{month} FROM oe_hdr oh JOIN invoice_line il ON il.order_no = oh.order_no JOIN invoice_hdr ih ON ih.invoice_no = il.invoice_no WHERE oh.rental_billing_flag = 'U' AND ih.invoice_date >= DATEFROMPARTS( YEAR(DATEADD(month, {offset}, GETDATE())), MONTH(DATEADD(month, {offset}, GETDATE())), 1 ) AND ih.invoice_date < DATEFROMPARTS( YEAR(DATEADD(month, {next_offset}, GETDATE())), MONTH(DATEADD(month, {next_offset}, GETDATE())), 1 );"
-        else:  # Even IDs: Rental Count (same as ID 24)
-            new_sql = f"SELECT COUNT(DISTINCT oh.order_no) AS NewRentalCount_Month{month} FROM oe_hdr oh WHERE oh.rental_billing_flag = 'U' AND oh.order_date >= DATEFROMPARTS( YEAR(DATEADD(month, {offset}, GETDATE())), MONTH(DATEADD(month, {offset}, GETDATE())), 1 ) AND oh.order_date < DATEFROMPARTS( YEAR(DATEADD(month, {next_offset}, GETDATE())), MONTH(DATEADD(month, {next_offset}, GETDATE())), 1 );"
+        tpl = RENTAL_VALUE_TPL if id % 2 == 1 else RENTAL_COUNT_TPL
+        new_sql = tpl.format(month=month, offset=offset, next_offset=next_offset)
 
         old_sql = item['productionSqlExpression']
         if old_sql != new_sql:
@@ -48,8 +70,10 @@ def fix_first_12():
             changes_made += 1
 
     # Save the fixed file
-    with open('hooks/dashboard-data/historical-data.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    if changes_made > 0:
+        _dump_json(data, DATA_FILE)
+    else:
+        print("ℹ️  No changes needed; skipping write")
 
     print(f"✅ Successfully fixed {changes_made} entries (IDs 1-12)")
     print("🎯 All criteria met:")
@@ -4,40 +4,83 @@ Script to fix production mode initialization by adding prodValue: null to all da
 This ensures that in production mode, charts start with null values until SQL executions populate them.
 """
 
-import json
+import asyncio
+import logging
 import os
 import sys
 
-def add_prod_value_to_file(filepath):
-    """Add prodValue: null to all entries in a JSON file if it doesn't exist."""
-    print(f"Processing: {filepath}")
+try:
+    import orjson
+except ImportError:  # stdlib fallback when orjson isn't installed
+    orjson = None
+    import json
 
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _parse_json(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _already_patched(raw):
+    """Cheap byte scan: every entry carries an "id", so if "prodValue" appears
+    exactly as often the file is taken to be clean and isn't parsed.
+
+    This is a heuristic, not a guarantee: the counts also match when one
+    entry lacks prodValue and the key turns up somewhere else. Any mismatch
+    falls through to the full parse.
+    """
+    ids = raw.count(b'"id"')
+    return ids > 0 and raw.count(b'"prodValue"') == ids
+
+def _dump_json(data, path):
+    # Encode once and write once; json.dump issues a write() per token.
+    if orjson:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+def _add_prod_value(filepath):
+    """Add prodValue: null to all entries in a JSON file if it doesn't exist.
+
+    Returns a (filepath, status, changes, detail) tuple; status is one of
+    'updated', 'clean', 'skipped' or 'error'. Only I/O and JSON decoding
+    failures are reported as 'error'; anything else is a bug and propagates.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        raw = _read_bytes(filepath)
+        if _already_patched(raw):
+            return filepath, 'clean', 0, 'prodValue already exists'
+
+        data = _parse_json(raw)
 
         if not isinstance(data, list):
-            print(f"  ❌ Not an array, skipping")
-            return False
+            return filepath, 'skipped', 0, 'not an array'
 
-        changes_made = 0
-        for item in data:
-            if isinstance(item, dict) and 'prodValue' not in item:
-                item['prodValue'] = None
-                changes_made += 1
+        entries = [item for item in data if isinstance(item, dict)]
+        changes_made = sum(1 for item in entries if 'prodValue' not in item)
+        for item in entries:
+            item.setdefault('prodValue', None)
 
         if changes_made > 0:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            print(f"  ✅ Added prodValue: null to {changes_made} entries")
-            return True
-        else:
-            print(f"  ℹ️  No changes needed (prodValue already exists)")
-            return False
-
-    except Exception as e:
-        print(f"  ❌ Error processing {filepath}: {e}")
-        return False
+            _dump_json(data, filepath)
+            return filepath, 'updated', changes_made, 'added prodValue: null'
+        return filepath, 'clean', 0, 'prodValue already exists'
+
+    except (OSError, ValueError) as e:
+        return filepath, 'error', 0, str(e)
+
+async def add_prod_value_to_file(filepath):
+    """Patch one file on a worker thread."""
+    return await asyncio.to_thread(_add_prod_value, filepath)
+
+async def process_files(filepaths):
+    """Read, patch and write all files concurrently; results come back in input order."""
+    return await asyncio.gather(
+        *(add_prod_value_to_file(p) for p in filepaths), return_exceptions=True
+    )
 
 # List of all dashboard data files that need prodValue fields
 data_files = [
@@ -53,27 +96,41 @@ data_files = [
     'hooks/dashboard-data/service.json'
 ]
 
-print("🔧 Fixing production mode initialization...")
-print("=" * 50)
+STATUS_ICONS = {'updated': '✅', 'clean': 'ℹ️ ', 'skipped': '❌', 'error': '❌', 'missing': '⚠️ '}
 
-total_changes = 0
-files_changed = 0
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger('fix_production_mode')
 
-for filepath in data_files:
-    if os.path.exists(filepath):
-        if add_prod_value_to_file(filepath):
-            total_changes += 1
-            files_changed += 1
-    else:
-        print(f"⚠️  File not found: {filepath}")
+existing_files = [p for p in data_files if os.path.exists(p)]
+results = [(p, 'missing', 0, 'file not found') for p in data_files if p not in existing_files]
+unexpected = []
+for filepath, result in zip(existing_files, asyncio.run(process_files(existing_files))):
+    if isinstance(result, BaseException):
+        unexpected.append(result)
+        result = (filepath, 'error', 0, f'unexpected {type(result).__name__}: {result}')
+    results.append(result)
+results.sort(key=lambda r: data_files.index(r[0]))
 
-print("=" * 50)
-print(f"📊 Summary: {files_changed} files updated, {total_changes} changes made")
-print("🎯 Production mode now properly initializes with null values!")
+files_changed = sum(1 for r in results if r[1] == 'updated')
+total_changes = sum(r[2] for r in results)
+
+width = max(len(p) for p in data_files)
+lines = ["🔧 Fixing production mode initialization...", "=" * 50]
+lines += [f"{STATUS_ICONS[status]} {path:<{width}}  {status:<8} {changes:>4}  {detail}"
+          for path, status, changes, detail in results]
+lines += ["=" * 50,
+          f"📊 Summary: {files_changed} files updated, {total_changes} changes made",
+          "🎯 Production mode now properly initializes with null values!"]
 
 if files_changed > 0:
-    print("\n📝 What this fixes:")
-    print("   • Charts will show empty/null initially in production mode")
-    print("   • Only SQL execution results will populate prodValue fields")
-    print("   • Demo data is preserved in 'value' field for demo mode")
-    print("   • Charts receive truly live data from database queries")
+    lines += ["",
+              "📝 What this fixes:",
+              "   • Charts will show empty/null initially in production mode",
+              "   • Only SQL execution results will populate prodValue fields",
+              "   • Demo data is preserved in 'value' field for demo mode",
+              "   • Charts receive truly live data from database queries"]
+
+logger.info("\n".join(lines))
+
+if unexpected:
+    raise unexpected[0]
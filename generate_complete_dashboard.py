@@ -1,237 +1,225 @@
-import json
-from datetime import datetime
+import argparse
+import os
+import sys
+from collections import Counter, namedtuple
+from datetime import datetime, timezone
+from itertools import chain
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback when orjson isn't installed
+    orjson = None
+    import json
+
+parser = argparse.ArgumentParser(description='Generate hooks/dashboard-data.json')
+parser.add_argument('--pretty', action='store_true',
+                    help='indent the output for human-readable diffs (default: compact)')
+args = parser.parse_args()
 
 # Read the existing partial data to preserve existing entries
 try:
-    with open('hooks/dashboard-data.json', 'r') as f:
-        existing_data = json.load(f)
+    with open('hooks/dashboard-data.json', 'rb') as f:
+        raw = f.read()
+        existing_data = orjson.loads(raw) if orjson else json.loads(raw)
         existing_dict = {item['id']: item for item in existing_data}
 except:
     existing_dict = {}
 
-# Define the complete structure
-data = []
+# Month boundaries are computed here at generation time and baked into the SQL
+# as literal dates, so the generated file should be regenerated each month.
+GENERATED_AT = datetime.now(timezone.utc)
+LAST_UPDATED = sys.intern(GENERATED_AT.isoformat(timespec='milliseconds').replace('+00:00', 'Z'))
+THIS_MONTH = GENERATED_AT.date().replace(day=1)
+
+def _add_months(first_of_month, offset):
+    """Shift a first-of-month date by `offset` calendar months."""
+    year, month = divmod(first_of_month.month - 1 + offset, 12)
+    return first_of_month.replace(year=first_of_month.year + year, month=month + 1)
+
+def _month_start(offset):
+    """SQL date literal for the first day of the month `offset` months from now."""
+    return f"'{_add_months(THIS_MONTH, offset):%Y-%m-%d}'"
+
+# Month-start boundaries for the 12-month window plus the following month, so
+# MONTH_STARTS[month] / MONTH_STARTS[month + 1] bracket each calendar month.
+MONTH_STARTS = [_month_start(-11 + m) for m in range(13)]
+# (year, period) pairs for the same 12-month window, for period-keyed tables.
+MONTH_PERIODS = [(d.year, d.month) for d in (_add_months(THIS_MONTH, -11 + m) for m in range(12))]
+# filterValue labels for the same window, shared by every monthly entry.
+MONTH_FILTER_VALUES = [f'current_month-{11-m}' for m in range(12)]
+
+# Fields shared by every generated entry
+P21_ENTRY = {'serverName': 'P21', 'lastUpdated': LAST_UPDATED}
+
+# Per-entry fields, in the order the make_* factories pass them
+ENTRY_KEYS = ('id', 'chartGroup', 'variableName', 'dataPoint', 'tableName', 'productionSqlExpression',
+              'value', 'calculationType', 'valueColumn', 'filterColumn', 'filterValue')
+
+def make_entry(*values):
+    """Build an entry from values given in ENTRY_KEYS order. Groups without a
+    filter (Key Metrics) pass fewer values and zip leaves those keys out."""
+    entry = dict(P21_ENTRY)
+    entry.update(zip(ENTRY_KEYS, values))
+    return entry
+
+# Web-order detection predicate shared by every Web Orders query
+WEB_ORDER_FILTER = "( LTRIM(RTRIM(COALESCE(h.web_shopper_id, N''))) <> N'' OR LTRIM(RTRIM(COALESCE(h.web_shopper_email,N''))) <> N'' OR LTRIM(RTRIM(COALESCE(h.web_reference_no, N''))) <> N'' )"
 
-# AR Aging (IDs 1-5) - keep existing
+# AR Aging (IDs 1-5)
 aging_brackets = ['1-30', '31-60', '61-90', '90+', 'Current']
 aging_months = [-11, -8, -5, -2, 0]
 aging_values = [60000, 35000, 15000, 5000, 140000]
 aging_columns = ['amount_30', 'amount_60', 'amount_90', 'amount_over', 'current_balance']
 
-for i in range(1, 6):
-    if i in existing_dict:
-        data.append(existing_dict[i])
-    else:
-        bracket = aging_brackets[i-1]
-        data.append({
-            'id': i,
-            'chartGroup': 'AR Aging',
-            'variableName': f'AR Aging Amount Due {bracket} Days' if bracket != 'Current' else 'AR Aging Amount Due Current',
-            'dataPoint': bracket,
-            'serverName': 'P21',
-            'tableName': 'balances',
-            'productionSqlExpression': f'SELECT SUM(cumulative_balance) AS result FROM balances WHERE year_for_period = CAST(YEAR(DATEADD(month, {aging_months[i-1]}, GETDATE())) AS decimal(9,0)) AND period = CAST(MONTH(DATEADD(month, {aging_months[i-1]}, GETDATE())) AS decimal(9,0));',
-            'value': aging_values[i-1],
-            'calculationType': 'Totalize receivables within the specified temporal bracket.',
-            'lastUpdated': '2024-08-01T00:00:00.000Z',
-            'valueColumn': aging_columns[i-1],
-            'filterColumn': 'age_bracket',
-            'filterValue': f'{bracket} Days' if bracket != 'Current' else 'Current'
-        })
+def make_ar_aging(i):
+    # The reference date is computed once in a derived table rather than
+    # repeating DATEADD for the year and the period. The MCP servers only
+    # accept statements starting with SELECT, so DECLARE/WITH are not options.
+    bracket = aging_brackets[i-1]
+    return make_entry(
+        i,
+        'AR Aging',
+        f'AR Aging Amount Due {bracket} Days' if bracket != 'Current' else 'AR Aging Amount Due Current',
+        bracket,
+        'balances',
+        f'SELECT SUM(b.cumulative_balance) AS result FROM balances b CROSS JOIN (SELECT DATEADD(month, {aging_months[i-1]}, GETDATE()) AS ref_date) AS d WHERE b.year_for_period = CAST(YEAR(d.ref_date) AS decimal(9,0)) AND b.period = CAST(MONTH(d.ref_date) AS decimal(9,0));',
+        aging_values[i-1],
+        'Totalize receivables within the specified temporal bracket.',
+        aging_columns[i-1],
+        'age_bracket',
+        f'{bracket} Days' if bracket != 'Current' else 'Current'
+    )
+
+# Monthly groups: each variable of a group gets one entry per month of the
+# 12-month window. A spec holds everything that varies by variable; its `sql`
+# template is formatted with the month's bounds ({lo}/{hi} month-start dates,
+# {year}/{period} for period-keyed tables) and `value` maps the month index to
+# the demo value. Names and calculationType strings live on the spec, so they
+# are built once per variable and shared by all twelve of its entries.
+MonthlySpec = namedtuple('MonthlySpec', 'data_point variable_name table_name sql value calculation_type')
+
+def make_monthly(entry_id, group, month, spec):
+    year, period = MONTH_PERIODS[month]
+    return make_entry(
+        entry_id,
+        group,
+        spec.variable_name,
+        spec.data_point,
+        spec.table_name,
+        spec.sql.format(lo=MONTH_STARTS[month], hi=MONTH_STARTS[month + 1], year=year, period=period),
+        spec.value(month),
+        spec.calculation_type,
+        spec.data_point,
+        'month',
+        MONTH_FILTER_VALUES[month]
+    )
 
 # Accounts (IDs 6-41) - 3 variables x 12 months
-account_vars = ['payable', 'receivable', 'overdue']
-for month in range(12):
-    for var_idx, var_name in enumerate(account_vars):
-        entry_id = 6 + month * 3 + var_idx
-        if entry_id in existing_dict:
-            data.append(existing_dict[entry_id])
-        else:
-            if var_name == 'payable':
-                sql_expr = f'SELECT SUM(total_amount) AS result FROM p21_view_soa_get_gl_daily_summaries WHERE account_type = \'Liability\' AND year_for_period = YEAR(DATEADD(month, -{11-month}, GETDATE())) AND period = MONTH(DATEADD(month, -{11-month}, GETDATE()));'
-                table_name = 'gl'
-                base_value = 1200 + month * 100
-            elif var_name == 'receivable':
-                sql_expr = f'SELECT SUM(b.cumulative_balance) AS result FROM balances b JOIN chart_of_accts a ON a.account_no = b.account_no WHERE (a.account_no LIKE \'11%\' OR a.account_type LIKE \'%AR%\') AND b.year_for_period = YEAR(DATEADD(month, -{11-month}, GETDATE())) AND b.period = MONTH(DATEADD(month, -{11-month}, GETDATE()));'
-                table_name = 'balances'
-                base_value = 58000 + month * 1000
-            else:  # overdue
-                sql_expr = f'SELECT b.year_for_period, b.period, SUM(b.cumulative_balance) AS ar_ending_balance FROM balances b JOIN chart_of_accts a ON a.account_no = b.account_no WHERE (a.account_no LIKE \'11%\' OR a.account_type LIKE \'%AR%\') AND b.year_for_period = YEAR(DATEADD(month, -{11-month}, GETDATE())) AND b.period = MONTH(DATEADD(month, -{11-month}, GETDATE())) GROUP BY b.year_for_period, b.period;'
-                table_name = 'balances'
-                base_value = max(6000, 8500 - month * 100)
-            
-            data.append({
-                'id': entry_id,
-                'chartGroup': 'Accounts',
-                'variableName': f'Accounts {var_name.title()}',
-                'dataPoint': var_name,
-                'serverName': 'P21',
-                'tableName': table_name,
-                'productionSqlExpression': sql_expr,
-                'value': base_value,
-                'calculationType': f'Totalize {var_name} for the appropriate calendar month.',
-                'lastUpdated': '2024-08-01T00:00:00.000Z',
-                'valueColumn': var_name,
-                'filterColumn': 'month',
-                'filterValue': f'current_month-{11-month}'
-            })
-
-# Web Orders (IDs 42-65) - 2 variables x 12 months  
-web_vars = ['count', 'amount']
-for month in range(12):
-    for var_idx, var_name in enumerate(web_vars):
-        entry_id = 42 + month * 2 + var_idx
-        if entry_id in existing_dict:
-            data.append(existing_dict[entry_id])
-        else:
-            base_sql = f'SELECT {"COUNT(*)" if var_name == "count" else "SUM(total_amount)"} AS result FROM oe_hdr AS h WHERE h.order_date >= DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1) AND h.order_date < DATEADD(month, 1, DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1)) AND ( LTRIM(RTRIM(COALESCE(h.web_shopper_id, N\'\'))) <> N\'\' OR LTRIM(RTRIM(COALESCE(h.web_shopper_email,N\'\'))) <> N\'\' OR LTRIM(RTRIM(COALESCE(h.web_reference_no, N\'\'))) <> N\'\' );'
-            
-            data.append({
-                'id': entry_id,
-                'chartGroup': 'Web Orders',
-                'variableName': f'Web Orders {var_name.title()}',
-                'dataPoint': var_name,
-                'serverName': 'P21',
-                'tableName': 'oe_hdr',
-                'productionSqlExpression': base_sql,
-                'value': 150 + month * 10 if var_name == 'count' else 12000 + month * 500,
-                'calculationType': f'{"Count" if var_name == "count" else "Sum"} web orders for the appropriate calendar month.',
-                'lastUpdated': '2024-08-01T00:00:00.000Z',
-                'valueColumn': var_name,
-                'filterColumn': 'month',
-                'filterValue': f'current_month-{11-month}'
-            })
-
-# Inventory (IDs 66-73) - keep existing
+account_specs = [
+    MonthlySpec('payable', 'Accounts Payable', 'gl',
+                "SELECT SUM(total_amount) AS result FROM p21_view_soa_get_gl_daily_summaries WHERE account_type = 'Liability' AND year_for_period = {year} AND period = {period};",
+                lambda month: 1200 + month * 100,
+                'Totalize payable for the appropriate calendar month.'),
+    MonthlySpec('receivable', 'Accounts Receivable', 'balances',
+                "SELECT SUM(b.cumulative_balance) AS result FROM balances b JOIN chart_of_accts a ON a.account_no = b.account_no WHERE (a.account_no LIKE '11%' OR a.account_type LIKE '%AR%') AND b.year_for_period = {year} AND b.period = {period};",
+                lambda month: 58000 + month * 1000,
+                'Totalize receivable for the appropriate calendar month.'),
+    MonthlySpec('overdue', 'Accounts Overdue', 'balances',
+                "SELECT b.year_for_period, b.period, SUM(b.cumulative_balance) AS ar_ending_balance FROM balances b JOIN chart_of_accts a ON a.account_no = b.account_no WHERE (a.account_no LIKE '11%' OR a.account_type LIKE '%AR%') AND b.year_for_period = {year} AND b.period = {period} GROUP BY b.year_for_period, b.period;",
+                lambda month: max(6000, 8500 - month * 100),
+                'Totalize overdue for the appropriate calendar month.'),
+]
+
+# Web Orders (IDs 42-65) - 2 variables x 12 months
+web_specs = [
+    MonthlySpec('count', 'Web Orders Count', 'oe_hdr',
+                'SELECT COUNT(*) AS result FROM oe_hdr AS h WHERE h.order_date >= {lo} AND h.order_date < {hi} AND ' + WEB_ORDER_FILTER + ';',
+                lambda month: 150 + month * 10,
+                'Count web orders for the appropriate calendar month.'),
+    MonthlySpec('amount', 'Web Orders Amount', 'oe_hdr',
+                'SELECT SUM(total_amount) AS result FROM oe_hdr AS h WHERE h.order_date >= {lo} AND h.order_date < {hi} AND ' + WEB_ORDER_FILTER + ';',
+                lambda month: 12000 + month * 500,
+                'Sum web orders for the appropriate calendar month.'),
+]
+
+# Inventory (IDs 66-73)
 inventory_categories = ['Electronics', 'Automotive', 'Tools', 'Hardware', 'Office Supplies', 'Safety Equipment', 'Industrial', 'Miscellaneous']
 inventory_ids = ['ELECTRONICS', 'AUTOMOTIVE', 'TOOLS', 'HARDWARE', 'OFFICE', 'SAFETY', 'INDUSTRIAL', 'MISC']
 inventory_values = [250000, 180000, 95000, 120000, 45000, 75000, 320000, 65000]
 
-for i in range(8):
-    entry_id = 66 + i
-    if entry_id in existing_dict:
-        data.append(existing_dict[entry_id])
-    else:
-        category = inventory_categories[i]
-        data.append({
-            'id': entry_id,
-            'chartGroup': 'Inventory',
-            'variableName': f'Inventory Value {category}',
-            'dataPoint': category.lower().replace(' ', '_'),
-            'serverName': 'P21',
-            'tableName': 'inventory_mast',
-            'productionSqlExpression': f'SELECT SUM(qty_on_hand * avg_cost) AS result FROM inventory_mast WHERE inv_mast_uid IN (SELECT inv_mast_uid FROM item WHERE item_class_id = \'{inventory_ids[i]}\') AND date_created <= DATEADD(month, -11, GETDATE());',
-            'value': inventory_values[i],
-            'calculationType': 'Calculate inventory value by category for the appropriate calendar month.',
-            'lastUpdated': '2024-08-01T00:00:00.000Z',
-            'valueColumn': 'value',
-            'filterColumn': 'category',
-            'filterValue': category
-        })
+def make_inventory(entry_id, i):
+    category = inventory_categories[i]
+    return make_entry(
+        entry_id,
+        'Inventory',
+        f'Inventory Value {category}',
+        category.lower().replace(' ', '_'),
+        'inventory_mast',
+        f'SELECT SUM(qty_on_hand * avg_cost) AS result FROM inventory_mast WHERE inv_mast_uid IN (SELECT inv_mast_uid FROM item WHERE item_class_id = \'{inventory_ids[i]}\') AND date_created <= DATEADD(month, -11, GETDATE());',
+        inventory_values[i],
+        'Calculate inventory value by category for the appropriate calendar month.',
+        'value',
+        'category',
+        category
+    )
 
 # POR Overview (IDs 74-97) - 2 variables x 12 months
-por_vars = ['orders', 'revenue']
-for month in range(12):
-    for var_idx, var_name in enumerate(por_vars):
-        entry_id = 74 + month * 2 + var_idx
-        data.append({
-            'id': entry_id,
-            'chartGroup': 'POR Overview',
-            'variableName': f'POR {var_name.title()}',
-            'dataPoint': var_name,
-            'serverName': 'P21',
-            'tableName': 'oe_hdr' if var_name == 'orders' else 'invoice_hdr',
-            'productionSqlExpression': f'SELECT {"COUNT(*)" if var_name == "orders" else "SUM(total_amount)"} AS result FROM {"oe_hdr" if var_name == "orders" else "invoice_hdr"} WHERE {"order_date" if var_name == "orders" else "invoice_date"} >= DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1) AND {"order_date" if var_name == "orders" else "invoice_date"} < DATEADD(month, 1, DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1));',
-            'value': 450 + month * 20 if var_name == 'orders' else 85000 + month * 2000,
-            'calculationType': f'{"Count" if var_name == "orders" else "Sum"} POR data for the appropriate calendar month.',
-            'lastUpdated': '2024-08-01T00:00:00.000Z',
-            'valueColumn': var_name,
-            'filterColumn': 'month',
-            'filterValue': f'current_month-{11-month}'
-        })
+por_specs = [
+    MonthlySpec('orders', 'POR Orders', 'oe_hdr',
+                'SELECT COUNT(*) AS result FROM oe_hdr WHERE order_date >= {lo} AND order_date < {hi};',
+                lambda month: 450 + month * 20,
+                'Count POR data for the appropriate calendar month.'),
+    MonthlySpec('revenue', 'POR Revenue', 'invoice_hdr',
+                'SELECT SUM(total_amount) AS result FROM invoice_hdr WHERE invoice_date >= {lo} AND invoice_date < {hi};',
+                lambda month: 85000 + month * 2000,
+                'Sum POR data for the appropriate calendar month.'),
+]
 
 # Daily Orders (IDs 98-104) - 7 days
-for day in range(7):
-    entry_id = 98 + day
-    data.append({
-        'id': entry_id,
-        'chartGroup': 'Daily Orders',
-        'variableName': f'Daily Orders Day {day + 1}',
-        'dataPoint': f'day_{day + 1}',
-        'serverName': 'P21',
-        'tableName': 'oe_hdr',
-        'productionSqlExpression': f'SELECT COUNT(*) AS result FROM oe_hdr WHERE order_date = DATEADD(day, -{6-day}, CAST(GETDATE() AS DATE));',
-        'value': 45 + day * 5,
-        'calculationType': 'Count daily orders for specific day.',
-        'lastUpdated': '2024-08-01T00:00:00.000Z',
-        'valueColumn': 'orders',
-        'filterColumn': 'day',
-        'filterValue': f'day-{6-day}'
-    })
+def make_daily_order(entry_id, day):
+    return make_entry(
+        entry_id,
+        'Daily Orders',
+        f'Daily Orders Day {day + 1}',
+        f'day_{day + 1}',
+        'oe_hdr',
+        f'SELECT COUNT(*) AS result FROM oe_hdr WHERE order_date = DATEADD(day, -{6-day}, CAST(GETDATE() AS DATE));',
+        45 + day * 5,
+        'Count daily orders for specific day.',
+        'orders',
+        'day',
+        f'day-{6-day}'
+    )
 
 # Historical Data (IDs 105-140) - 3 variables x 12 months
-hist_vars = ['sales', 'orders', 'customers']
-for month in range(12):
-    for var_idx, var_name in enumerate(hist_vars):
-        entry_id = 105 + month * 3 + var_idx
-        if var_name == 'sales':
-            table_name = 'invoice_hdr'
-            sql_expr = f'SELECT SUM(total_amount) AS result FROM invoice_hdr WHERE invoice_date >= DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1) AND invoice_date < DATEADD(month, 1, DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1));'
-            base_value = 75000 + month * 3000
-        elif var_name == 'orders':
-            table_name = 'oe_hdr'
-            sql_expr = f'SELECT COUNT(*) AS result FROM oe_hdr WHERE order_date >= DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1) AND order_date < DATEADD(month, 1, DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1));'
-            base_value = 850 + month * 50
-        else:  # customers
-            table_name = 'customer'
-            sql_expr = f'SELECT COUNT(DISTINCT customer_id) AS result FROM oe_hdr WHERE order_date >= DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1) AND order_date < DATEADD(month, 1, DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1));'
-            base_value = 125 + month * 8
-        
-        data.append({
-            'id': entry_id,
-            'chartGroup': 'Historical Data',
-            'variableName': f'Historical {var_name.title()}',
-            'dataPoint': var_name,
-            'serverName': 'P21',
-            'tableName': table_name,
-            'productionSqlExpression': sql_expr,
-            'value': base_value,
-            'calculationType': f'Historical {var_name} data for the appropriate calendar month.',
-            'lastUpdated': '2024-08-01T00:00:00.000Z',
-            'valueColumn': var_name,
-            'filterColumn': 'month',
-            'filterValue': f'current_month-{11-month}'
-        })
+hist_specs = [
+    MonthlySpec('sales', 'Historical Sales', 'invoice_hdr',
+                'SELECT SUM(total_amount) AS result FROM invoice_hdr WHERE invoice_date >= {lo} AND invoice_date < {hi};',
+                lambda month: 75000 + month * 3000,
+                'Historical sales data for the appropriate calendar month.'),
+    MonthlySpec('orders', 'Historical Orders', 'oe_hdr',
+                'SELECT COUNT(*) AS result FROM oe_hdr WHERE order_date >= {lo} AND order_date < {hi};',
+                lambda month: 850 + month * 50,
+                'Historical orders data for the appropriate calendar month.'),
+    MonthlySpec('customers', 'Historical Customers', 'customer',
+                'SELECT COUNT(DISTINCT customer_id) AS result FROM oe_hdr WHERE order_date >= {lo} AND order_date < {hi};',
+                lambda month: 125 + month * 8,
+                'Historical customers data for the appropriate calendar month.'),
+]
 
 # Customer Metrics (IDs 141-164) - 2 variables x 12 months
-customer_vars = ['new_customers', 'retained_customers']
-for month in range(12):
-    for var_idx, var_name in enumerate(customer_vars):
-        entry_id = 141 + month * 2 + var_idx
-        if var_name == 'new_customers':
-            sql_expr = f'SELECT COUNT(*) AS result FROM customer WHERE date_created >= DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1) AND date_created < DATEADD(month, 1, DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1));'
-            base_value = 25 + month * 2
-        else:  # retained_customers
-            sql_expr = f'SELECT COUNT(DISTINCT c.customer_id) AS result FROM customer c JOIN oe_hdr o ON c.customer_id = o.customer_id WHERE o.order_date >= DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1) AND o.order_date < DATEADD(month, 1, DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1)) AND c.date_created < DATEFROMPARTS(YEAR(DATEADD(month,{-11+month},GETDATE())), MONTH(DATEADD(month,{-11+month},GETDATE())), 1);'
-            base_value = 95 + month * 5
-        
-        data.append({
-            'id': entry_id,
-            'chartGroup': 'Customer Metrics',
-            'variableName': f'Customer {var_name.replace("_", " ").title()}',
-            'dataPoint': var_name,
-            'serverName': 'P21',
-            'tableName': 'customer',
-            'productionSqlExpression': sql_expr,
-            'value': base_value,
-            'calculationType': f'Customer metrics for the appropriate calendar month.',
-            'lastUpdated': '2024-08-01T00:00:00.000Z',
-            'valueColumn': var_name,
-            'filterColumn': 'month',
-            'filterValue': f'current_month-{11-month}'
-        })
-
-# Key Metrics (IDs 165-171) - keep existing
+customer_specs = [
+    MonthlySpec('new_customers', 'Customer New Customers', 'customer',
+                'SELECT COUNT(*) AS result FROM customer WHERE date_created >= {lo} AND date_created < {hi};',
+                lambda month: 25 + month * 2,
+                'Customer metrics for the appropriate calendar month.'),
+    MonthlySpec('retained_customers', 'Customer Retained Customers', 'customer',
+                'SELECT COUNT(DISTINCT c.customer_id) AS result FROM customer c JOIN oe_hdr o ON c.customer_id = o.customer_id WHERE o.order_date >= {lo} AND o.order_date < {hi} AND c.date_created < {lo};',
+                lambda month: 95 + month * 5,
+                'Customer metrics for the appropriate calendar month.'),
+]
+
+# Key Metrics (IDs 165-171)
 key_metrics = [
     ('Total Sales YTD', 'Total Orders', 'SELECT COUNT(order_no) AS result FROM oe_hdr;', 12540),
     ('Total Orders YTD', 'Open Orders (/day)', 'SELECT COUNT(order_no) AS result FROM oe_hdr WHERE status = \'open\' AND CAST(order_date AS DATE) = CAST(GETDATE() AS DATE);', 85),
@@ -242,57 +230,127 @@ key_metrics = [
     ('Customer Retention Rate', 'Total Sales (Monthly)', 'SELECT SUM(total_amount) AS result FROM invoice_hdr WHERE invoice_date >= DATEADD(month, DATEDIFF(month, 0, GETDATE()), 0) AND invoice_date < DATEADD(month, DATEDIFF(month, 0, GETDATE()) + 1, 0);', 8345000)
 ]
 
-for i, (var_name, data_point, sql_expr, value) in enumerate(key_metrics):
-    entry_id = 165 + i
-    if entry_id in existing_dict:
-        data.append(existing_dict[entry_id])
-    else:
-        data.append({
-            'id': entry_id,
-            'chartGroup': 'Key Metrics',
-            'variableName': var_name,
-            'dataPoint': data_point,
-            'serverName': 'P21',
-            'tableName': 'oe_hdr' if 'order' in sql_expr.lower() else 'invoice_hdr',
-            'productionSqlExpression': sql_expr,
-            'value': value,
-            'calculationType': f'Key business metrics calculation.',
-            'lastUpdated': '2024-08-01T00:00:00.000Z',
-            'valueColumn': 'order_no' if 'order_no' in sql_expr else 'total_amount'
-        })
-
-# Site Distribution (IDs 172-174) - keep existing
+def make_key_metric(entry_id, var_name, data_point, sql_expr, value):
+    return make_entry(
+        entry_id,
+        'Key Metrics',
+        var_name,
+        data_point,
+        'oe_hdr' if 'order' in sql_expr.lower() else 'invoice_hdr',
+        sql_expr,
+        value,
+        f'Key business metrics calculation.',
+        'order_no' if 'order_no' in sql_expr else 'total_amount'
+    )
+
+# Site Distribution (IDs 172-174)
 site_locations = ['Columbus', 'Addison', 'City']
-for i, location in enumerate(site_locations):
-    entry_id = 172 + i
-    if entry_id in existing_dict:
-        data.append(existing_dict[entry_id])
-    else:
-        data.append({
-            'id': entry_id,
-            'chartGroup': 'Site Distribution',
-            'variableName': f'Site Distribution {location}',
-            'dataPoint': location,
-            'serverName': 'P21',
-            'tableName': 'branch',
-            'productionSqlExpression': f'SELECT COUNT(*) as result FROM branch WHERE location_name = \'{location}\';',
-            'value': 1,
-            'calculationType': 'Totalize revenue from the specified geographical locus.',
-            'lastUpdated': '2024-08-01T00:00:00.000Z',
-            'valueColumn': 'sales',
-            'filterColumn': 'site_name',
-            'filterValue': location
-        })
-
-# Sort data by ID to ensure proper order
-data.sort(key=lambda x: x['id'])
-
-# Save the complete data
-with open('hooks/dashboard-data.json', 'w') as f:
-    json.dump(data, f, indent=4)
-
-print(f'Generated complete dashboard data with {len(data)} entries')
-print(f'ID range: {data[0]["id"]} to {data[-1]["id"]}')
+
+def make_site(entry_id, location):
+    return make_entry(
+        entry_id,
+        'Site Distribution',
+        f'Site Distribution {location}',
+        location,
+        'branch',
+        f'SELECT COUNT(*) as result FROM branch WHERE location_name = \'{location}\';',
+        1,
+        'Totalize revenue from the specified geographical locus.',
+        'sales',
+        'site_name',
+        location
+    )
+
+# Per-group generators, each yielding entries in ascending id order. Groups
+# that take `existing` reuse entries already present in
+# hooks/dashboard-data.json and only build the missing ones.
+def gen_ar_aging(existing):
+    for i in range(1, 6):
+        yield existing.get(i) or make_ar_aging(i)
+
+def gen_monthly_group(existing, start_id, group, specs):
+    for month in range(12):
+        for var_idx, spec in enumerate(specs):
+            entry_id = start_id + month * len(specs) + var_idx
+            yield existing.get(entry_id) or make_monthly(entry_id, group, month, spec)
+
+def gen_inventory(existing):
+    for i in range(8):
+        entry_id = 66 + i
+        yield existing.get(entry_id) or make_inventory(entry_id, i)
+
+def gen_daily_orders():
+    for day in range(7):
+        yield make_daily_order(98 + day, day)
+
+def gen_key_metrics(existing):
+    for i, (var_name, data_point, sql_expr, value) in enumerate(key_metrics):
+        entry_id = 165 + i
+        yield existing.get(entry_id) or make_key_metric(entry_id, var_name, data_point, sql_expr, value)
+
+def gen_sites(existing):
+    for i, location in enumerate(site_locations):
+        entry_id = 172 + i
+        yield existing.get(entry_id) or make_site(entry_id, location)
+
+# Define the complete structure. POR Overview, Historical Data and Customer
+# Metrics are always rebuilt, so they get an empty lookup instead of existing_dict.
+groups = [
+    gen_ar_aging(existing_dict),
+    gen_monthly_group(existing_dict, 6, 'Accounts', account_specs),
+    gen_monthly_group(existing_dict, 42, 'Web Orders', web_specs),
+    gen_inventory(existing_dict),
+    gen_monthly_group({}, 74, 'POR Overview', por_specs),
+    gen_daily_orders(),
+    gen_monthly_group({}, 105, 'Historical Data', hist_specs),
+    gen_monthly_group({}, 141, 'Customer Metrics', customer_specs),
+    gen_key_metrics(existing_dict),
+    gen_sites(existing_dict),
+]
+
+def encode_entry(entry):
+    """Serialize one entry. The file is machine-consumed, so it is compact
+    unless --pretty is given, in which case entries are indented one level to
+    sit inside the top-level array."""
+    if orjson:
+        if args.pretty:
+            return orjson.dumps(entry, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+        return orjson.dumps(entry)
+    if args.pretty:
+        return json.dumps(entry, indent=2).replace('\n', '\n  ').encode('utf-8')
+    return json.dumps(entry, separators=(',', ':')).encode('utf-8')
+
+# Save the complete data. Entries are encoded and written one at a time as the
+# generators produce them, so only the current entry is held in memory. The
+# output goes to a temporary file first so a failure can't truncate the
+# existing dashboard data.
+check_order = bool(os.getenv('DASHBOARD_CHECK_ORDER'))
+group_counts = Counter()
+entry_count = 0
+first_id = last_id = None
+open_bracket, separator, close_bracket = (b'[\n  ', b',\n  ', b'\n]') if args.pretty else (b'[', b',', b']')
+
+tmp_path = 'hooks/dashboard-data.json.tmp'
+with open(tmp_path, 'wb') as f:
+    f.write(open_bracket)
+    for entry in chain.from_iterable(groups):
+        if entry_count:
+            f.write(separator)
+            # The generators emit ids in ascending order, so no sort is needed.
+            # Set DASHBOARD_CHECK_ORDER=1 to verify that while editing the groups.
+            if check_order:
+                assert last_id < entry['id'], 'dashboard entries out of id order'
+        else:
+            first_id = entry['id']
+        f.write(encode_entry(entry))
+        last_id = entry['id']
+        group_counts[entry['chartGroup']] += 1
+        entry_count += 1
+    f.write(close_bracket)
+os.replace(tmp_path, 'hooks/dashboard-data.json')
+
+print(f'Generated complete dashboard data with {entry_count} entries')
+print(f'ID range: {first_id} to {last_id}')
 
 # Verify structure
 structure_check = {
@@ -309,5 +367,4 @@ structure_check = {
 }
 
 for group, (start, end, expected) in structure_check.items():
-    count = len([d for d in data if d['chartGroup'] == group])
-    print(f'{group}: {count}/{expected} entries (IDs {start}-{end})')
+    print(f'{group}: {group_counts[group]}/{expected} entries (IDs {start}-{end})')
@@ -4,51 +4,200 @@ Debug version of P21 MCP Server
 Enhanced logging and error handling for debugging 500 errors
 """
 
-import json
+import atexit
+import decimal
+import functools
 import logging
+import operator
 import os
+import queue
+import re
 import sys
+import threading
 import time
 import traceback
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from logging.handlers import QueueHandler, QueueListener
+import orjson
 import pyodbc
 
-# Configure detailed logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s %(levelname)s:%(name)s:%(lineno)d: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('mcp_server_debug.log')
-    ]
+# Let the ODBC driver manager pool connections too, so a connection that
+# overflows our own pool is still cheap to reopen. Must be set before the
+# first connect.
+pyodbc.pooling = True
+
+# Configure detailed logging. INFO by default; set P21_LOG_LEVEL=DEBUG for the
+# per-connection and per-cursor trace. Request threads only enqueue records;
+# a background listener owns the console and file handlers, so no request
+# blocks on a log write.
+_log_formatter = logging.Formatter(
+    '%(asctime)s %(levelname)s:%(name)s:%(lineno)d: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
 )
+_log_handlers = [logging.StreamHandler(), logging.FileHandler('mcp_server_debug.log')]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush queued records on shutdown
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(getattr(logging, os.getenv("P21_LOG_LEVEL", "INFO").upper(), logging.INFO))
+_root_logger.addHandler(QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
+# Tracebacks are always logged but only sent back to clients when asked for:
+# they are costly to format and expose server internals.
+_RETURN_TRACEBACK = bool(os.getenv("P21_RETURN_TRACEBACK"))
+_TRACEBACK_LIMIT = 20
+
+# read_table_column projects one column; itemgetter unpacks it in C
+_first_column = operator.itemgetter(0)
+
+# Only SELECT statements are accepted; matching the prefix stops at the first
+# keyword instead of upper-casing a copy of the whole query.
+_SELECT_RE = re.compile(r'\s*select\b', re.IGNORECASE)
+
+# A leading SELECT [DISTINCT|ALL] with no TOP, so execute_sql can push its row
+# limit into the query. OFFSET/FETCH paging can't be combined with TOP, and a
+# top-level UNION/INTERSECT/EXCEPT would only limit its first branch. Both
+# lookaheads are needed: if the optional DISTINCT/ALL backtracks away, the
+# second one still sees a TOP that follows it.
+_NO_TOP_RE = re.compile(
+    r'^(\s*select(?:\s+(?:distinct|all)\b)?)(?!\s+top\b)(?!\s+(?:distinct|all)\s+top\b)\s+',
+    re.IGNORECASE)
+_OFFSET_RE = re.compile(r'\boffset\b', re.IGNORECASE)
+
+# Table and column names interpolated into read_table_column's SQL
+_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Trailing statement terminators, and the tokens scanned for top-level clauses:
+# string literals and bracketed names are matched whole so parentheses or
+# keywords inside them are skipped
+_TRAILING_TERMINATOR_RE = re.compile(r'[\s;]+$')
+_CLAUSE_SCAN_RE = re.compile(
+    r"'(?:[^']|'')*'|\[[^\]]*\]|(\()|(\))|\b(order\s+by)\b|\b(union|intersect|except)\b",
+    re.IGNORECASE)
+
+def _has_set_operator(sql_query: str) -> bool:
+    """True if UNION, INTERSECT or EXCEPT combines result sets at the top level."""
+    depth = 0
+    for match in _CLAUSE_SCAN_RE.finditer(sql_query):
+        if match.group(1):
+            depth += 1
+        elif match.group(2):
+            depth -= 1
+        elif match.group(4) and depth == 0:
+            return True
+    return False
+
+def _with_top(sql_query: str, limit) -> str:
+    """Add TOP {limit} to a SELECT that has none, so SQL Server stops producing
+    rows at the limit instead of execute_sql discarding them after the fact."""
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return sql_query
+    if limit <= 0 or _OFFSET_RE.search(sql_query) or _has_set_operator(sql_query):
+        return sql_query
+    return _NO_TOP_RE.sub(rf'\1 TOP {limit} ', sql_query, count=1)
+
+def _count_sql(sql_query: str) -> str:
+    """Wrap a SELECT as SELECT COUNT(*) FROM (...) for count_only.
+
+    Trailing semicolons are dropped, as is a trailing top-level ORDER BY
+    (not allowed in a derived table unless OFFSET/FETCH pages it, in which
+    case it is kept). Every column of the query must be named: a derived
+    table rejects unnamed expressions, so SUM(x) needs an alias.
+    """
+    sql_query = _TRAILING_TERMINATOR_RE.sub('', sql_query)
+    depth = 0
+    order_by_at = None
+    for match in _CLAUSE_SCAN_RE.finditer(sql_query):
+        if match.group(1):
+            depth += 1
+        elif match.group(2):
+            depth -= 1
+        elif match.group(3) and depth == 0:
+            order_by_at = match.start()
+    if order_by_at is not None and not _OFFSET_RE.search(sql_query, order_by_at):
+        sql_query = sql_query[:order_by_at].rstrip()
+    return f"SELECT COUNT(*) FROM ({sql_query}) AS _sub"
+
+def _json_default(value):
+    """orjson fallback for the driver types it can't serialize natively.
+
+    Dates, datetimes and UUIDs are handled by orjson itself; Decimal columns
+    become floats and anything else is stringified.
+    """
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+class ResponseCache:
+    """Thread-safe LRU of encoded responses whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, body = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
 class P21Server:
     """P21 Database operations with enhanced debugging."""
 
     def __init__(self):
         self.dsn = os.getenv("P21_DSN", "P21live").strip()
-        self.connection_string = None
-        self._connection_pool: list = []
+        # Built once here so get_connection doesn't need a readiness check
+        self.connection_string = f"DSN={self.dsn};" if self.dsn else None
         self.max_pool_size = 3
+        # LIFO so the most recently used (warmest) connection is handed out first
+        self._connection_pool = queue.LifoQueue(maxsize=self.max_pool_size)
         self.is_connected = False
 
     def connect(self):
-        """Set up connection to P21 database."""
+        """Check the P21 configuration at startup.
+
+        The test connection costs a full round-trip, so it only runs when
+        P21_VERIFY_ON_START is set; otherwise the first query connects.
+        """
         try:
-            if not self.dsn:
+            if not self.connection_string:
                 raise ValueError("P21_DSN environment variable must be set")
 
-            self.connection_string = f"DSN={self.dsn};"
-            logger.info(f"Connecting to P21 database via DSN: {self.dsn}")
-
-            test_conn = pyodbc.connect(self.connection_string, timeout=10)
-            test_conn.close()
+            if os.getenv("P21_VERIFY_ON_START"):
+                logger.info(f"Connecting to P21 database via DSN: {self.dsn}")
+                test_conn = pyodbc.connect(self.connection_string, timeout=10)
+                test_conn.close()
+                logger.info("Successfully connected to P21 database")
+            else:
+                logger.info(f"Using P21 DSN: {self.dsn}")
 
             self.is_connected = True
-            logger.info("Successfully connected to P21 database")
 
         except Exception as e:
             logger.error(f"Failed to connect to P21 database: {e}")
@@ -56,33 +205,41 @@ class P21Server:
             raise
 
     def get_connection(self):
-        """Get database connection from pool."""
-        if not self.is_connected or not self.connection_string:
-            self.connect()
+        """Get a (connection, cursor) pair from the pool.
+
+        Each pooled connection keeps its cursor, so reuse skips cursor
+        allocation as well as the connect.
+        """
+        assert self.connection_string, "P21_DSN environment variable must be set"
 
         try:
-            if self._connection_pool:
-                conn = self._connection_pool.pop()
+            try:
+                conn, cursor = self._connection_pool.get_nowait()
                 logger.debug("Reused connection from pool")
-                return conn
+                return conn, cursor
+            except queue.Empty:
+                pass
 
             conn = pyodbc.connect(self.connection_string, timeout=5)
             logger.debug("Created new database connection")
-            return conn
+            return conn, conn.cursor()
 
         except Exception as e:
             logger.error(f"Failed to get database connection: {e}")
             raise
 
-    def close_connection(self, conn):
-        """Return connection to pool."""
+    def close_connection(self, conn, cursor):
+        """Return a connection and its cursor to the pool."""
         try:
-            if len(self._connection_pool) < self.max_pool_size:
-                self._connection_pool.append(conn)
-                logger.debug("Connection returned to pool")
-            else:
-                conn.close()
-                logger.debug("Connection pool full, connection closed")
+            # Discard any pending result sets so the cursor is clean for
+            # the next caller; the next execute() drops unread rows.
+            while cursor.nextset():
+                pass
+            self._connection_pool.put_nowait((conn, cursor))
+            logger.debug("Connection returned to pool")
+        except queue.Full:
+            conn.close()
+            logger.debug("Connection pool full, connection closed")
         except Exception as e:
             logger.error(f"Error closing connection: {e}")
             try:
@@ -90,33 +247,64 @@ class P21Server:
             except:
                 pass
 
-    def execute_sql(self, sql_query: str, limit: int = 1000) -> dict:
-        """Execute arbitrary SQL query with enhanced debugging."""
+    def execute_sql(self, sql_query: str, limit: int = 1000, result_format: str = None,
+                    count_only: bool = False) -> dict:
+        """Execute arbitrary SQL query with enhanced debugging.
+
+        result_format='columnar' returns "rows" as lists of values in column
+        order instead of "data" as one dict per row. count_only=True has the
+        database count the rows and returns only "row_count"; limit does not
+        apply to the count, and every selected column must be named (see
+        _count_sql).
+        """
         start_time = time.time()
         conn = None
+        _dbg = logger.isEnabledFor(logging.DEBUG)
         try:
             logger.info(f"=== Starting SQL execution ===")
             logger.info(f"Query: {sql_query}")
             logger.info(f"Limit: {limit}")
 
             # Security checks
-            sql_upper = sql_query.upper().strip()
-            if not sql_upper.startswith('SELECT'):
+            if not _SELECT_RE.match(sql_query):
                 logger.warning(f"Blocked non-SELECT query: {sql_query}")
                 return {
                     "success": False,
                     "error": "Only SELECT statements are allowed"
                 }
 
-            logger.debug("Getting database connection...")
-            conn = self.get_connection()
-            logger.debug(f"Connection type: {type(conn)}")
+            if limit is not None:
+                try:
+                    limit = int(limit)
+                except (TypeError, ValueError):
+                    return {
+                        "success": False,
+                        "error": f"limit must be an integer, got {limit!r}"
+                    }
 
-            logger.debug("Creating cursor...")
-            cursor = conn.cursor()
-            logger.debug(f"Cursor type: {type(cursor)}")
+            if _dbg:
+                logger.debug("Getting database connection...")
+            conn, cursor = self.get_connection()
+            if _dbg:
+                logger.debug(f"Connection type: {type(conn)}")
+                logger.debug(f"Cursor type: {type(cursor)}")
+            # Size the fetch buffer once so fetchmany(limit) is a single batch
+            cursor.arraysize = min(limit, 1000) if limit and limit > 0 else 1000
+
+            if count_only:
+                count_sql = _count_sql(sql_query)
+                logger.info(f"Executing count query: {count_sql}")
+                row_count = cursor.execute(count_sql).fetchval()
+                elapsed = time.time() - start_time
+                logger.info(f"Counted {row_count} rows in {elapsed:.2f} seconds")
+                return {
+                    "success": True,
+                    "row_count": row_count,
+                    "execution_time": elapsed
+                }
 
-            logger.info("Executing SQL query...")
+            sql_query = _with_top(sql_query, limit)
+            logger.info(f"Executing SQL query: {sql_query}")
             try:
                 cursor.execute(sql_query)
                 logger.info("Query executed successfully")
@@ -126,56 +314,31 @@ class P21Server:
                 raise
 
             # Get column information
-            logger.debug("Getting column information...")
             if cursor.description:
                 columns = [column[0] for column in cursor.description]
-                column_types = [(col[0], col[1].__name__ if hasattr(col[1], '__name__') else str(col[1])) for col in cursor.description]
                 logger.info(f"Columns: {columns}")
-                logger.debug(f"Column types: {column_types}")
             else:
                 logger.warning("No cursor description available")
                 columns = []
 
             logger.info("Fetching results...")
-            if limit:
+            if limit and limit > 0:
                 rows = cursor.fetchmany(limit)
             else:
                 rows = cursor.fetchall()
 
             logger.info(f"Fetched {len(rows)} raw rows")
 
-            # Convert rows to dictionaries
-            logger.debug("Converting rows to dictionaries...")
-            data = []
-            for row_idx, row in enumerate(rows):
-                logger.debug(f"Processing row {row_idx}: {row}")
-                row_dict = {}
-                for i, value in enumerate(row):
-                    column_name = columns[i] if i < len(columns) else f"column_{i}"
-
-                    # Detailed type conversion
-                    try:
-                        if hasattr(value, '__float__'):
-                            processed_value = float(value)
-                            logger.debug(f"  {column_name}: Decimal({value}) -> {processed_value}")
-                        elif hasattr(value, '__int__'):
-                            processed_value = int(value)
-                            logger.debug(f"  {column_name}: Int({value}) -> {processed_value}")
-                        elif value is None:
-                            processed_value = None
-                            logger.debug(f"  {column_name}: NULL")
-                        else:
-                            processed_value = str(value)
-                            logger.debug(f"  {column_name}: {type(value)}({repr(value)}) -> '{processed_value}'")
-
-                        row_dict[column_name] = processed_value
-                    except Exception as type_error:
-                        logger.error(f"Type conversion error for {column_name}: {type_error}")
-                        row_dict[column_name] = str(value)
-
-                data.append(row_dict)
-
-            cursor.close()
+            # Values stay as driver types and are converted by orjson when
+            # the response is serialized
+            if result_format == 'columnar':
+                # Column names are sent once rather than repeated in every row
+                payload_key = "rows"
+                data = [list(row) for row in rows]
+            else:
+                payload_key = "data"
+                data = [dict(zip(columns, row)) for row in rows]
+
             elapsed = time.time() - start_time
             logger.info(f"SQL execution completed in {elapsed:.2f} seconds")
 
@@ -183,7 +346,7 @@ class P21Server:
                 "success": True,
                 "row_count": len(data),
                 "columns": columns,
-                "data": data,
+                payload_key: data,
                 "execution_time": elapsed
             }
 
@@ -193,19 +356,65 @@ class P21Server:
             logger.error(f"Query: {sql_query}")
             logger.error(f"Exception: {e}")
             logger.error(f"Exception type: {type(e)}")
-            logger.error(f"Full traceback:\n{traceback.format_exc()}")
+            tb = traceback.format_exc(limit=_TRACEBACK_LIMIT)
+            logger.error(f"Full traceback:\n{tb}")
 
-            return {
+            result = {
                 "success": False,
                 "error": str(e),
-                "traceback": traceback.format_exc(),
                 "execution_time": elapsed
             }
+            if _RETURN_TRACEBACK:
+                result["traceback"] = tb
+            return result
 
         finally:
             if conn:
                 logger.debug("Closing connection...")
-                self.close_connection(conn)
+                self.close_connection(conn, cursor)
+
+    def stream_sql(self, sql_query: str, limit: int = None, chunk_size: int = 1000):
+        """Execute a SELECT and yield its result in batches.
+
+        The first item is the column list, followed by one list of row dicts
+        per fetchmany(chunk_size), so only a single batch is held in memory.
+        The connection goes back to the pool when the generator is exhausted
+        or closed.
+        """
+        if not sql_query or not _SELECT_RE.match(sql_query):
+            logger.warning(f"Blocked non-SELECT query: {sql_query}")
+            raise ValueError("Only SELECT statements are allowed")
+
+        conn, cursor = self.get_connection()
+        try:
+            cursor.arraysize = chunk_size
+            logger.info(f"Streaming query: {sql_query}")
+            cursor.execute(sql_query)
+            if not cursor.description:
+                yield []
+                return
+            columns = [column[0] for column in cursor.description]
+            yield columns
+
+            remaining = limit if limit and limit > 0 else None
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                if remaining is not None:
+                    remaining -= len(rows)
+                yield [dict(zip(columns, row)) for row in rows]
+        finally:
+            self.close_connection(conn, cursor)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _column_sql(table_name: str, column_name: str, limit: int) -> str:
+        """Return the SELECT for a column read, built once per (table, column, limit)."""
+        if limit and limit > 0:
+            return f"SELECT TOP {int(limit)} [{column_name}] FROM [{table_name}]"
+        return f"SELECT [{column_name}] FROM [{table_name}]"
 
     def read_table_column(self, table_name: str, column_name: str,
                          where_clause: str = None, limit: int = 100) -> dict:
@@ -227,31 +436,28 @@ class P21Server:
                     "success": False,
                     "error": "Table name and column name are required"
                 }
+            if not (_IDENTIFIER_RE.match(table_name) and _IDENTIFIER_RE.match(column_name)):
+                return {
+                    "success": False,
+                    "error": "Table and column names may only contain letters, digits and underscores"
+                }
 
             logger.debug("Getting database connection...")
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            # Build SQL query
-            if limit and limit > 0:
-                sql = f"SELECT TOP {limit} [{column_name}] FROM [{table_name}]"
-            else:
-                sql = f"SELECT [{column_name}] FROM [{table_name}]"
+            conn, cursor = self.get_connection()
 
+            # Build SQL query from the cached per-shape template
+            sql = self._column_sql(table_name, column_name, limit)
             if where_clause:
                 sql += f" WHERE {where_clause}"
 
             logger.info(f"Executing: {sql}")
+            cursor.arraysize = limit if limit and limit > 0 else 1000
             cursor.execute(sql)
 
-            # Fetch results
-            rows = cursor.fetchall()
-            logger.info(f"Fetched {len(rows)} rows")
-
-            # Extract column values
-            data = [row[0] for row in rows]
+            # Fetch results and unpack the single column
+            data = list(map(_first_column, cursor.fetchall()))
+            logger.info(f"Fetched {len(data)} rows")
 
-            cursor.close()
             elapsed = time.time() - start_time
             logger.info(f"Table column read completed in {elapsed:.2f} seconds")
 
@@ -270,23 +476,173 @@ class P21Server:
             logger.error(f"=== CRITICAL ERROR AFTER {elapsed:.2f}s ===")
             logger.error(f"Query: {sql}")
             logger.error(f"Exception: {e}")
-            logger.error(f"Full traceback:\n{traceback.format_exc()}")
+            tb = traceback.format_exc(limit=_TRACEBACK_LIMIT)
+            logger.error(f"Full traceback:\n{tb}")
 
-            return {
+            result = {
                 "success": False,
                 "error": str(e),
                 "table": table_name,
                 "column": column_name,
-                "traceback": traceback.format_exc(),
                 "execution_time": elapsed
             }
+            if _RETURN_TRACEBACK:
+                result["traceback"] = tb
+            return result
 
         finally:
             if conn:
                 logger.debug("Closing connection...")
-                self.close_connection(conn)
+                self.close_connection(conn, cursor)
+
+# Status lines and the fixed JSON/CORS header block, encoded once at import.
+# Responses are written as one bytes object instead of a series of
+# send_response/send_header calls.
+_STATUS_LINES = {200: b' 200 OK\r\n', 500: b' 500 Internal Server Error\r\n'}
+_JSON_HEADERS = (
+    b'Content-Type: application/json\r\n'
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: POST, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Content-Type\r\n'
+)
 
 class DebugRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive: the dashboard reuses one connection for its requests. Every
+    # response must therefore carry a Content-Length or be chunked.
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, body):
+        """Write status line, headers and body in a single write."""
+        self.log_request(status, len(body))
+        self.wfile.write(b''.join((
+            self.protocol_version.encode('ascii'),
+            _STATUS_LINES[status],
+            _JSON_HEADERS,
+            b'Connection: close\r\n' if self.close_connection else b'',
+            b'Content-Length: %d\r\n\r\n' % len(body),
+            body,
+        )))
+
+    def _read_body(self, content_length):
+        """Read exactly content_length bytes of request body into one buffer."""
+        body = bytearray(content_length)
+        view = memoryview(body)
+        received = 0
+        while received < content_length:
+            n = self.rfile.readinto(view[received:])
+            if not n:
+                raise ConnectionError(
+                    f"Client closed connection after {received} of {content_length} body bytes")
+            received += n
+        return body
+
+    def _send_stream(self, pieces):
+        """Write a response whose body is produced piece by piece.
+
+        HTTP/1.1 clients get chunked transfer encoding; on HTTP/1.0 the body
+        is delimited by closing the connection.
+        """
+        chunked = self.protocol_version != 'HTTP/1.0' and self.request_version != 'HTTP/1.0'
+        self.log_request(200)
+        self.wfile.write(b''.join((
+            self.protocol_version.encode('ascii'),
+            _STATUS_LINES[200],
+            _JSON_HEADERS,
+            b'Transfer-Encoding: chunked\r\n\r\n' if chunked else b'Connection: close\r\n\r\n',
+        )))
+        for piece in pieces:
+            if not piece:
+                continue  # a zero-length chunk would end the body early
+            if chunked:
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(piece), piece))
+            else:
+                self.wfile.write(piece)
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.close_connection = True
+
+    @staticmethod
+    def _stream_body(columns, batches, start_time):
+        """Encode a streamed result as the same JSON document execute_sql returns.
+
+        The data array is written batch by batch; row_count, execution_time
+        and success trail it, so a failure mid-stream can still be reported.
+        """
+        yield b'{"columns":' + orjson.dumps(columns) + b',"data":['
+        row_count = 0
+        tail = {"success": True}
+        try:
+            for rows in batches:
+                if not rows:
+                    continue
+                chunk = orjson.dumps(rows, default=_json_default)[1:-1]
+                yield b',' + chunk if row_count else chunk
+                row_count += len(rows)
+        except Exception as e:
+            logger.error(f"Streaming failed after {row_count} rows: {e}")
+            tail = {"success": False, "error": str(e)}
+        finally:
+            batches.close()
+        tail["row_count"] = row_count
+        tail["execution_time"] = time.time() - start_time
+        logger.info(f"Streamed {row_count} rows in {tail['execution_time']:.2f} seconds")
+        yield b'],' + orjson.dumps(tail)[1:]
+
+    def _stream_sql(self, arguments):
+        """Run execute_sql in streaming mode and write the result as it is fetched.
+
+        Runs on the request thread rather than db_executor: the connection is
+        held for as long as the client takes to read, and a slow reader should
+        not occupy one of the executor's slots.
+        """
+        start_time = time.time()
+        batches = p21_server.stream_sql(arguments.get('sql_query'), limit=arguments.get('limit'))
+        try:
+            columns = next(batches)
+        except Exception as e:
+            logger.error(f"Streaming query failed: {e}")
+            self._send_json(200, orjson.dumps({
+                "success": False,
+                "error": str(e),
+                "execution_time": time.time() - start_time
+            }))
+            return
+        self._send_stream(self._stream_body(columns, batches, start_time))
+
+    @staticmethod
+    def _batch_execute(queries):
+        """Run several execute_sql calls concurrently and return all results.
+
+        Each query is submitted to db_executor, so up to max_pool_size run at
+        once on separate pooled connections and the batch takes roughly as
+        long as its slowest query. Results keep the order of the request.
+        """
+        if not isinstance(queries, list):
+            return {
+                "success": False,
+                "error": "queries must be a list of {sql_query, limit, format} objects"
+            }
+
+        start_time = time.time()
+        futures = [
+            db_executor.submit(
+                p21_server.execute_sql,
+                sql_query=query.get('sql_query'),
+                limit=query.get('limit', 1000),
+                result_format=query.get('format'),
+                count_only=bool(query.get('count_only'))
+            )
+            for query in queries
+        ]
+        results = [future.result() for future in futures]
+        return {
+            "success": all(result.get("success") for result in results),
+            "count": len(results),
+            "results": results,
+            "execution_time": time.time() - start_time
+        }
+
     def do_POST(self):
         logger.info("=== RECEIVED POST REQUEST ===")
         logger.info(f"Path: {self.path}")
@@ -295,34 +651,55 @@ class DebugRequestHandler(BaseHTTPRequestHandler):
         if self.path == '/call_tool':
             try:
                 content_length = int(self.headers['Content-Length'])
-                post_data = self.rfile.read(content_length)
-                request_body = post_data.decode('utf-8')
+                request_body = self._read_body(content_length)
 
-                logger.info(f"Request body length: {len(request_body)}")
-                logger.info(f"Request body: {request_body}")
+                logger.info(f"Request body length: {content_length}")
 
-                request_data = json.loads(request_body)
+                request_data = orjson.loads(request_body)
                 tool_name = request_data.get('name')
                 arguments = request_data.get('arguments', {})
 
                 logger.info(f"Tool name: {tool_name}")
                 logger.info(f"Arguments: {arguments}")
 
+                if tool_name == 'execute_sql' and arguments.get('stream'):
+                    logger.info("=== STREAMING EXECUTE_SQL ===")
+                    self._stream_sql(arguments)
+                    return
+
+                # Dashboards re-issue the same queries on every refresh, so
+                # identical calls within CACHE_TTL seconds get the encoded
+                # response of the first one.
+                cache_key = (tool_name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS))
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Cache hit, sending {len(cached)} bytes")
+                    self._send_json(200, cached)
+                    return
+
                 if tool_name == 'execute_sql':
                     logger.info("=== CALLING EXECUTE_SQL ===")
-                    result = p21_server.execute_sql(
+                    result = db_executor.submit(
+                        p21_server.execute_sql,
                         sql_query=arguments.get('sql_query'),
-                        limit=arguments.get('limit', 1000)
-                    )
+                        limit=arguments.get('limit', 1000),
+                        result_format=arguments.get('format'),
+                        count_only=bool(arguments.get('count_only'))
+                    ).result()
 
                 elif tool_name == 'read_table_column':
                     logger.info("=== CALLING READ_TABLE_COLUMN ===")
-                    result = p21_server.read_table_column(
+                    result = db_executor.submit(
+                        p21_server.read_table_column,
                         table_name=arguments.get('table_name'),
                         column_name=arguments.get('column_name'),
                         where_clause=arguments.get('where_clause'),
                         limit=arguments.get('limit', 100)
-                    )
+                    ).result()
+
+                elif tool_name == 'batch_execute':
+                    logger.info("=== CALLING BATCH_EXECUTE ===")
+                    result = self._batch_execute(arguments.get('queries'))
 
                 else:
                     result = {
@@ -330,41 +707,39 @@ class DebugRequestHandler(BaseHTTPRequestHandler):
                         "error": f"Unknown tool: {tool_name}"
                     }
 
-                logger.info(f"=== RESULT: {json.dumps(result, indent=2)[:500]}... ===")
-
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-                self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-                self.end_headers()
-
-                response = json.dumps(result, indent=2).encode('utf-8')
+                response = orjson.dumps(result, default=_json_default)
+                if result.get("success"):
+                    response_cache.put(cache_key, response)
                 logger.info(f"Sending response with {len(response)} bytes")
-                self.wfile.write(response)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Response preview: {response[:500]!r}")
+                self._send_json(200, response)
                 logger.info("=== RESPONSE SENT SUCCESSFULLY ===")
 
             except Exception as e:
                 logger.error("=== REQUEST HANDLER ERROR ===")
+                # The request body may be partly unread; don't reuse the connection
+                self.close_connection = True
                 logger.error(f"Exception: {e}")
                 logger.error(f"Type: {type(e)}")
-                logger.error(f"Full traceback:\n{traceback.format_exc()}")
-
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
+                tb = traceback.format_exc(limit=_TRACEBACK_LIMIT)
+                logger.error(f"Full traceback:\n{tb}")
 
-                error_response = json.dumps({
+                error = {
                     "success": False,
-                    "error": str(e),
-                    "traceback": traceback.format_exc()
-                }).encode('utf-8')
+                    "error": str(e)
+                }
+                if _RETURN_TRACEBACK:
+                    error["traceback"] = tb
+                error_response = orjson.dumps(error)
 
-                self.wfile.write(error_response)
+                self._send_json(500, error_response)
                 logger.error("=== ERROR RESPONSE SENT ===")
         else:
             logger.info(f"Unknown path: {self.path}")
             self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.send_header('Connection', 'close')  # the request body is left unread
             self.end_headers()
 
     def do_OPTIONS(self):
@@ -373,15 +748,26 @@ class DebugRequestHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
     def log_message(self, format, *args):
         # Suppress default HTTP server logging
-        logger.debug(f"HTTP: {format % args}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"HTTP: {format % args}")
 
 # Global server instance
 p21_server = P21Server()
 
+# Successful tool responses, keyed on tool name and sorted arguments.
+# CACHE_TTL=0 disables caching.
+response_cache = ResponseCache(maxsize=256, ttl=float(os.getenv("CACHE_TTL", "5")))
+
+# Each request gets its own thread; the database work itself runs on this
+# executor so at most max_pool_size queries are in flight, one per pooled
+# connection, while serialization and socket I/O overlap with them.
+db_executor = ThreadPoolExecutor(max_workers=p21_server.max_pool_size, thread_name_prefix='p21-db')
+
 def main():
     try:
         logger.info("=== STARTING DEBUG MCP SERVER ===")
@@ -396,7 +782,7 @@ def main():
         # Start HTTP server
         port = 8001
         logger.info(f"Starting HTTP server on port {port}")
-        server = HTTPServer(('localhost', port), DebugRequestHandler)
+        server = ThreadingHTTPServer(('localhost', port), DebugRequestHandler)
         logger.info(f"🚀 P21 Debug MCP Server running on http://localhost:{port}")
         logger.info("Send requests to /call_tool endpoint")
 
@@ -4,33 +4,296 @@ P21 HTTP Server
 HTTP server for P21 database operations using DSN: P21live
 """
 
-import json
+import asyncio
+import atexit
+import datetime
+import decimal
+import functools
+import gzip
 import logging
+import operator
 import os
+import queue
+import re
 import sys
+import tempfile
+import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import Any, Dict
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from itertools import chain, groupby
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import orjson
 import pyodbc
 
-# Configure logging
-# Configure logging with safer format to avoid potential Unicode issues
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s:%(name)s: %(message)s',
+try:
+    import turbodbc
+except ImportError:  # optional; the pyodbc path is used without it
+    turbodbc = None
+
+try:
+    import uvicorn
+except ImportError:  # optional; the stdlib threading server is used without it
+    uvicorn = None
+
+try:
+    import brotli
+except ImportError:  # optional; responses are gzipped instead
+    brotli = None
+
+# Let the ODBC driver manager keep physical connections alive across
+# connect/close so a replaced pool connection doesn't pay a full login
+pyodbc.pooling = True
+
+# Configure logging with safer format to avoid potential Unicode issues.
+# INFO by default; set P21_LOG_LEVEL=DEBUG for the per-request and per-query
+# trace. Request threads only enqueue records; a background listener owns the
+# console handler, so no request blocks on a log write.
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter(
+    '%(asctime)s %(levelname)s:%(name)s: %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
-)
+))
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush queued records on shutdown
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(getattr(logging, os.getenv("P21_LOG_LEVEL", "INFO").upper(), logging.INFO))
+_root_logger.addHandler(QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
+# P21_USE_UVICORN=1 serves the ASGI app below under uvicorn (uvloop/httptools
+# when installed) instead of the stdlib ThreadingHTTPServer. P21_UVICORN_WORKERS
+# runs that many worker processes, each with its own connection pool.
+USE_UVICORN = os.getenv("P21_USE_UVICORN") == "1" and uvicorn is not None
+UVICORN_WORKERS = int(os.getenv("P21_UVICORN_WORKERS", "1"))
+
+# Seconds a request waits for its tool call before answering with a timeout
+# error; the query itself finishes in the background and frees its slot
+TOOL_TIMEOUT = float(os.getenv("P21_TOOL_TIMEOUT", "60"))
+
+# Dashboard tiles re-read the same column slices on every refresh; successful
+# read_table_column results are reused for this many seconds (0 disables)
+QUERY_CACHE_TTL = float(os.getenv("P21_QUERY_TTL", "30"))
+QUERY_CACHE_SIZE = 256
+
+# P21_USE_TURBODBC=1 reads execute_sql and read_table_column results through
+# turbodbc's columnar NumPy fetch instead of row-by-row pyodbc
+USE_TURBODBC = os.getenv("P21_USE_TURBODBC") == "1" and turbodbc is not None
+
+# Seconds a data dictionary result is reused before the catalog is read
+# again; 0 disables the cache. At most SCHEMA_CACHE_SIZE table patterns are
+# kept, the oldest dropped first.
+SCHEMA_CACHE_TTL = float(os.getenv("P21_SCHEMA_TTL", "900"))
+SCHEMA_CACHE_SIZE = 32
+
+# uvicorn worker processes each keep their own schema cache, so with more than
+# one, invalidate_schema_cache also touches this file and every worker drops
+# its cache when it sees the file's mtime change
+SCHEMA_STAMP_FILE = (os.getenv("P21_SCHEMA_STAMP_FILE",
+                               os.path.join(tempfile.gettempdir(), "p21_http_schema.stamp"))
+                     if USE_UVICORN and UVICORN_WORKERS > 1 else None)
+
+def _schema_stamp() -> Optional[int]:
+    """mtime of SCHEMA_STAMP_FILE in ns, or None if it doesn't exist yet."""
+    try:
+        return os.stat(SCHEMA_STAMP_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+# A pooled connection idle for at least POOL_CHECK_IDLE seconds runs
+# POOL_HEALTH_QUERY before reuse, so one dropped by the server or a firewall
+# is replaced instead of failing the request. DSNs for databases without
+# FROM-less SELECTs can override it (e.g. "SELECT 1 FROM SYSIBM.SYSDUMMY1").
+POOL_HEALTH_QUERY = os.getenv("P21_POOL_HEALTH_QUERY", "SELECT 1")
+POOL_CHECK_IDLE = float(os.getenv("P21_POOL_CHECK_IDLE", "30"))
+
+# get_data_dictionary's "soa" column lists and their position in the schema
+# query's select list
+_SCHEMA_SOA_FIELDS = (
+    ("names", 4),
+    ("positions", 5),
+    ("data_types", 8),
+    ("is_nullable", 7),
+    ("default_values", 6),
+    ("max_lengths", 9),
+    ("numeric_precisions", 10),
+    ("numeric_scales", 11),
+    ("datetime_precisions", 12),
+)
+_table_name = operator.itemgetter(2)
+
+# Rows per fetchmany call; set as every pyodbc cursor's arraysize so a bare
+# fetchmany() returns batches of this size
+FETCH_BATCH_SIZE = 1000
+
+# execute_sql sends integers (and BIT) as ints, other numbers as floats,
+# dates and times in ISO 8601 and any other non-null value as a string
+_FLOAT_TYPES = (float, decimal.Decimal)
+_TEMPORAL_TYPES = (datetime.date, datetime.time)
+
+def _numpy_column_values(array) -> list:
+    """Convert a turbodbc result column to the values execute_sql returns."""
+    values = array.tolist()  # masked (NULL) entries become None
+    kind = array.dtype.kind
+    if kind in 'iufO':
+        return values
+    if kind == 'b':
+        return [value if value is None else int(value) for value in values]
+    if kind == 'M':
+        return [value if value is None else value.isoformat() for value in values]
+    return [value if value is None else str(value) for value in values]
+
+def _fetch_turbodbc_rows(cursor, limit: int, columnar: bool = False) -> list:
+    """Fetch up to limit rows (all if falsy) column-wise as execute_sql rows.
+
+    Rows are dicts, or value lists in column order when columnar.
+    """
+    columns = [column[0] for column in cursor.description]
+    data = []
+    for batch in cursor.fetchnumpybatches():
+        arrays = list(batch.values())
+        if limit:
+            arrays = [array[:limit - len(data)] for array in arrays]
+        rows = zip(*map(_numpy_column_values, arrays))
+        if columnar:
+            data.extend(map(list, rows))
+        else:
+            data.extend(dict(zip(columns, values)) for values in rows)
+        if limit and len(data) >= limit:
+            break
+    return data
+
+def _identity(value):
+    return value
+
+def _converter_for(type_code) -> Callable[[Any], Any]:
+    """Return the JSON conversion for a column with this cursor.description type code."""
+    if type_code is str:
+        return _identity
+    if isinstance(type_code, type):
+        if issubclass(type_code, int):
+            return int
+        if issubclass(type_code, _FLOAT_TYPES):
+            return float
+        if issubclass(type_code, _TEMPORAL_TYPES):
+            return type_code.isoformat
+    return str
+
+@functools.lru_cache(maxsize=128)
+def _row_converter(description: Tuple[Tuple[str, Any], ...]) -> Tuple[Tuple[str, ...], Callable[[Any], List[Any]]]:
+    """Return (column names, row -> converted value list) for a description.
+
+    description is the (name, type_code) pairs of cursor.description; a
+    dashboard reissues the same few queries, so each shape is worked out once.
+    Columns that need no conversion are copied without a per-value call.
+    """
+    columns = tuple(name for name, _ in description)
+    converters = [_converter_for(type_code) for _, type_code in description]
+    if all(convert is _identity for convert in converters):
+        return columns, list
+
+    def convert_row(row):
+        return [value if value is None else convert(value)
+                for convert, value in zip(converters, row)]
+    return columns, convert_row
+
+# execute_sql safety check, compiled once: the statement must start with
+# SELECT and may not contain a data- or schema-changing keyword
+_SELECT_RE = re.compile(r'\s*SELECT\b', re.IGNORECASE)
+_DANGEROUS_RE = re.compile(r'\b(?:DROP|DELETE|TRUNCATE|INSERT|UPDATE|ALTER|CREATE)\b', re.IGNORECASE)
+_SANDBOX_RE = re.compile(r'mcp_sandboxed_inv', re.IGNORECASE)
+
+# Table and column names are interpolated (identifiers can't be bound), so
+# they must be plain identifiers
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_$#@]{0,127}')
+
+def _validate_identifier(name: str, kind: str) -> str:
+    """Return name if it is a plain identifier, otherwise raise ValueError."""
+    if not isinstance(name, str) or not _IDENTIFIER_RE.fullmatch(name):
+        raise ValueError(f"Invalid {kind} name: {name!r}")
+    return name
+
+# SQLSTATEs meaning the connection itself is gone rather than the statement
+# having failed; such connections are closed instead of returned to the pool
+_DISCONNECT_SQLSTATES = frozenset({'08S01', '08003', '08001', 'HYT00'})
+
+def _is_disconnect(error: Exception) -> bool:
+    """True if a pyodbc error means the connection should be thrown away."""
+    return (isinstance(error, pyodbc.Error) and bool(error.args)
+            and error.args[0] in _DISCONNECT_SQLSTATES)
+
+def _rejected_sql(sql_query: str) -> Optional[str]:
+    """Return why execute_sql refuses sql_query, or None if it may run."""
+    # Allow only SELECT statements for safety
+    if not _SELECT_RE.match(sql_query):
+        return "Only SELECT statements are allowed for security reasons"
+    
+    # Check for dangerous keywords in SELECT statements. Whole words
+    # only, so columns like date_created or UpdatedAt pass.
+    dangerous = _DANGEROUS_RE.search(sql_query)
+    if dangerous:
+        return f"SQL contains potentially dangerous keyword: {dangerous.group().upper()}"
+    
+    # Handle sandboxed tables for testing/simulation
+    if _SANDBOX_RE.search(sql_query):
+        return "Connection to MCP Sandbox failed: Network timeout."
+    return None
+
+def _converted_batches(cursor, limit: Optional[int], columnar: bool):
+    """Yield an executed pyodbc cursor's rows a fetchmany batch at a time.
+
+    Each column's conversion is picked from its type code (see
+    _row_converter) instead of probing every value; None passes through. Rows are dicts keyed by
+    column name, or value lists in column order when columnar. A falsy
+    limit fetches every row.
+    """
+    columns, convert_row = _row_converter(tuple((column[0], column[1]) for column in cursor.description))
+    remaining = limit or None
+    while remaining is None or remaining > 0:
+        batch_size = FETCH_BATCH_SIZE if remaining is None else min(remaining, FETCH_BATCH_SIZE)
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        values = [convert_row(row) for row in rows]
+        yield values if columnar else [dict(zip(columns, row_values)) for row_values in values]
+        if remaining is not None:
+            remaining -= len(rows)
+
 class P21Server:
     """P21 Database operations."""
 
     def __init__(self):
         self.dsn = None
         self.connection_string = None
-        self._connection_pool = []
-        self.max_pool_size = 3
+        # At most max_pool_size connections are checked out at once; idle
+        # ones are kept LIFO as (conn, idle_since) so the most recently used
+        # is reused first
+        self.max_pool_size = int(os.getenv("P21_POOL_SIZE", "3"))
+        self._connection_pool: "queue.LifoQueue[Tuple[Any, float]]" = queue.LifoQueue()
+        self._pool_slots = threading.BoundedSemaphore(self.max_pool_size)
+        # LRU of read_table_column results: encoded arguments -> (cached_at, result)
+        self._query_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # Cursors kept open per pooled connection so a statement reissued with
+        # the same SQL text reuses its prepared handle: conn -> {key: cursor}
+        self._prepared_cursors: Dict[Any, Dict[Any, Any]] = {}
+        # turbodbc connections when USE_TURBODBC; db_executor already caps
+        # how many are in use at once
+        self._turbodbc_pool: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        # get_data_dictionary results as (cached_at, result) keyed by
+        # (table_pattern, columnar); the schema rarely changes, so these are served for
+        # SCHEMA_CACHE_TTL seconds
+        self._schema_cache: Dict[Tuple[Optional[str], bool], Tuple[float, Dict[str, Any]]] = {}
+        self._schema_cache_lock = threading.Lock()
+        self._schema_stamp = _schema_stamp() if SCHEMA_STAMP_FILE else None
 
     def setup_connection(self):
         """
@@ -54,9 +317,10 @@ class P21Server:
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    test_conn = pyodbc.connect(self.connection_string, timeout=10)
+                    test_conn = pyodbc.connect(self.connection_string, autocommit=True, timeout=10)
                     logger.info("Successfully connected to P21 database via local ODBC DSN")
-                    test_conn.close()
+                    # Keep the verified connection as the pool's first member
+                    self._connection_pool.put_nowait((test_conn, time.monotonic()))
                     return
                 except Exception as conn_error:
                     if attempt < max_retries - 1:
@@ -71,58 +335,188 @@ class P21Server:
             raise
 
     def get_connection(self):
-        """Get database connection - simplified version without pooling."""
-        try:
-            logger.info("Creating new database connection...")
-            
-            # Create fresh connection each time to avoid pooling issues
+        """Check out a connection, waiting while max_pool_size are in use."""
+        if not self.connection_string:
+            self.setup_connection()
             if not self.connection_string:
-                self.setup_connection()
-                if not self.connection_string:
-                    raise Exception("Unable to setup P21 database connection")
+                raise Exception("Unable to setup P21 database connection")
 
-            logger.info(f"Connecting with: {self.connection_string}")
-            conn = pyodbc.connect(self.connection_string, timeout=5)
+        self._pool_slots.acquire()
+        try:
+            try:
+                conn, idle_since = self._connection_pool.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                if time.monotonic() - idle_since < POOL_CHECK_IDLE or self._is_healthy(conn):
+                    return conn
+                logger.info("Replacing stale pooled connection")
+                self._prepared_cursors.pop(conn, None)
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+            # Every query here is a read, so skip the implicit transaction
+            conn = pyodbc.connect(self.connection_string, autocommit=True, timeout=5)
             logger.info("Database connection established successfully")
-            
             return conn
 
         except Exception as e:
+            self._pool_slots.release()
             logger.error(f"Failed to get database connection: {e}")
             raise
 
+    def _is_healthy(self, conn) -> bool:
+        """Run POOL_HEALTH_QUERY on conn; False if the connection is unusable."""
+        try:
+            cursor = conn.cursor()
+            cursor.execute(POOL_HEALTH_QUERY)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
     def close_connection(self, conn):
-        """Return connection to pool or close it."""
-        if len(self._connection_pool) < self.max_pool_size:
-            self._connection_pool.append(conn)
-        else:
+        """Return a checked-out connection to the pool."""
+        try:
+            self._connection_pool.put_nowait((conn, time.monotonic()))
+        finally:
+            self._pool_slots.release()
+
+    def discard_connection(self, conn):
+        """Close a checked-out connection that is no longer usable."""
+        self._prepared_cursors.pop(conn, None)
+        try:
             conn.close()
+        except Exception:
+            pass
+        finally:
+            self._pool_slots.release()
+
+    def prepared_cursor(self, conn, key):
+        """Return conn's retained cursor for key, creating it on first use.
+
+        pyodbc skips the prepare step when a cursor re-executes the SQL text
+        it last ran, so callers should use one key per distinct statement.
+        The cursor stays open; fetch its results fully and don't close it.
+        """
+        cursors = self._prepared_cursors.setdefault(conn, {})
+        cursor = cursors.get(key)
+        if cursor is None:
+            cursor = cursors[key] = conn.cursor()
+            cursor.arraysize = FETCH_BATCH_SIZE
+        return cursor
+
+    @contextmanager
+    def acquire(self):
+        """Check out a pooled connection for the duration of a with block.
+
+        A connection that failed with a disconnect error is closed instead
+        of going back to the pool; the next checkout opens a fresh one.
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
+        except Exception as e:
+            if _is_disconnect(e):
+                self.discard_connection(conn)
+            else:
+                self.close_connection(conn)
+            raise
+        else:
+            self.close_connection(conn)
     
+    @contextmanager
+    def acquire_turbodbc(self):
+        """Check out a pooled turbodbc connection; one that raised is closed."""
+        try:
+            conn = self._turbodbc_pool.get_nowait()
+        except queue.Empty:
+            conn = turbodbc.connect(dsn=self.dsn, turbodbc_options=turbodbc.make_options(
+                read_buffer_size=turbodbc.Megabytes(100), use_async_io=True, autocommit=True))
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            raise
+        else:
+            self._turbodbc_pool.put_nowait(conn)
+
+    def _cached_query(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached read_table_column result, or None."""
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= QUERY_CACHE_TTL:
+                del self._query_cache[key]
+                return None
+            self._query_cache.move_to_end(key)
+            return entry[1]
+
+    def _cache_query(self, key: bytes, result: Dict[str, Any]) -> None:
+        """Store a read_table_column result, evicting the least recently used entry."""
+        if QUERY_CACHE_TTL <= 0:
+            return
+        with self._query_cache_lock:
+            self._query_cache[key] = (time.monotonic(), result)
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
     def read_table_column(self, table_name: str, column_name: str, 
-                         where_clause: str = None, limit: int = 100) -> Dict[str, Any]:
-        """Read data from a specific table column."""
+                         where_clause: str = None, limit: int = 100,
+                         where_params: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Read data from a specific table column.
+
+        where_clause may contain ? placeholders, filled from where_params.
+        Successful results are cached for QUERY_CACHE_TTL seconds.
+        """
+        cache_key = orjson.dumps([table_name, column_name, where_clause, limit, where_params],
+                                 default=_json_default)
+        cached = self._cached_query(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            _validate_identifier(table_name, "table")
+            _validate_identifier(column_name, "column")
+            params = list(where_params or [])
             
             # Build SQL query
             if limit:
-                sql = f"SELECT TOP {limit} [{column_name}] FROM [{table_name}]"
+                sql = f"SELECT TOP (?) [{column_name}] FROM [{table_name}]"
+                params.insert(0, int(limit))
             else:
                 sql = f"SELECT [{column_name}] FROM [{table_name}]"
             
             if where_clause:
                 sql += f" WHERE {where_clause}"
             
-            logger.info(f"Executing query: {sql}")
-            cursor.execute(sql)
-            
-            # Fetch results
-            rows = cursor.fetchall()
-            data = [row[0] for row in rows]
-            cursor.close()
+            logger.debug("Executing query: %s", sql)
+            if USE_TURBODBC:
+                with self.acquire_turbodbc() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(sql, params)
+                    # The single column arrives as one array; NULLs become None
+                    data = next(iter(cursor.fetchallnumpy().values())).tolist()
+                    cursor.close()
+            else:
+                with self.acquire() as conn:
+                    cursor = conn.cursor()
+                    cursor.arraysize = FETCH_BATCH_SIZE
+                    cursor.execute(sql, params)
+                    
+                    # Fetch results
+                    data = [row[0] for row in chain.from_iterable(iter(cursor.fetchmany, []))]
+                    cursor.close()
             
-            return {
+            result = {
                 "success": True,
                 "table": table_name,
                 "column": column_name,
@@ -130,6 +524,8 @@ class P21Server:
                 "data": data,
                 "query": sql
             }
+            self._cache_query(cache_key, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error reading table column: {e}")
@@ -140,79 +536,133 @@ class P21Server:
                 "column": column_name
             }
 
-    def get_data_dictionary(self, table_pattern: str = None) -> Dict[str, Any]:
-        """Download data dictionary/schema information."""
+    def get_data_dictionary(self, table_pattern: str = None,
+                            result_format: str = "aos") -> Dict[str, Any]:
+        """Download data dictionary/schema information, cached for SCHEMA_CACHE_TTL seconds.
+
+        result_format "aos" gives each table's columns as a list of dicts;
+        "soa" gives them as parallel lists (names, positions, data_types, ...)
+        built by transposing the rows, with far fewer objects per column.
+        """
+        columnar = result_format == "soa"
+        cache_key = (table_pattern, columnar)
+        if SCHEMA_CACHE_TTL > 0:
+            with self._schema_cache_lock:
+                if SCHEMA_STAMP_FILE:
+                    stamp = _schema_stamp()
+                    if stamp != self._schema_stamp:
+                        # Another worker ran invalidate_schema_cache
+                        self._schema_cache.clear()
+                        self._schema_stamp = stamp
+                cached = self._schema_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+                logger.debug("Data dictionary served from cache")
+                return cached[1]
+
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Query to get table and column information
-            schema_query = """
-            SELECT 
-                t.TABLE_CATALOG,
-                t.TABLE_SCHEMA,
-                t.TABLE_NAME,
-                t.TABLE_TYPE,
-                c.COLUMN_NAME,
-                c.ORDINAL_POSITION,
-                c.COLUMN_DEFAULT,
-                c.IS_NULLABLE,
-                c.DATA_TYPE,
-                c.CHARACTER_MAXIMUM_LENGTH,
-                c.NUMERIC_PRECISION,
-                c.NUMERIC_SCALE,
-                c.DATETIME_PRECISION
-            FROM INFORMATION_SCHEMA.TABLES t
-            LEFT JOIN INFORMATION_SCHEMA.COLUMNS c ON t.TABLE_NAME = c.TABLE_NAME
-            WHERE t.TABLE_TYPE = 'BASE TABLE'
-            """
-            
-            if table_pattern:
-                schema_query += f" AND t.TABLE_NAME LIKE '{table_pattern}'"
-            
-            schema_query += " ORDER BY t.TABLE_NAME, c.ORDINAL_POSITION"
-            
-            logger.info("Fetching data dictionary...")
-            cursor.execute(schema_query)
-            
-            # Fetch all results
-            rows = cursor.fetchall()
-            
-            # Organize data by table
-            tables = {}
-            for row in rows:
-                table_name = row.TABLE_NAME
+            with self.acquire() as conn:
+                cursor = self.prepared_cursor(conn, ("schema", table_pattern is not None))
                 
-                if table_name not in tables:
+                # Query the catalog views directly; INFORMATION_SCHEMA wraps
+                # these in extra joins and conversions that are slow to compile
+                # on a catalog of P21's size. Aliases keep the INFORMATION_SCHEMA
+                # column names so rows read the same as before.
+                schema_query = """
+                SELECT 
+                    DB_NAME() AS TABLE_CATALOG,
+                    SCHEMA_NAME(t.schema_id) AS TABLE_SCHEMA,
+                    t.name AS TABLE_NAME,
+                    'BASE TABLE' AS TABLE_TYPE,
+                    c.name AS COLUMN_NAME,
+                    c.column_id AS ORDINAL_POSITION,
+                    OBJECT_DEFINITION(c.default_object_id) AS COLUMN_DEFAULT,
+                    c.is_nullable AS IS_NULLABLE,
+                    ty.name AS DATA_TYPE,
+                    CASE
+                        WHEN ty.name IN ('nchar', 'nvarchar') AND c.max_length > 0 THEN c.max_length / 2
+                        WHEN ty.name IN ('char', 'varchar', 'nchar', 'nvarchar', 'binary', 'varbinary') THEN c.max_length
+                        WHEN ty.name IN ('text', 'image') THEN 2147483647
+                        WHEN ty.name = 'ntext' THEN 1073741823
+                        WHEN ty.name = 'xml' THEN -1
+                    END AS CHARACTER_MAXIMUM_LENGTH,
+                    CASE WHEN ty.name IN ('tinyint', 'smallint', 'int', 'bigint', 'decimal', 'numeric',
+                                          'float', 'real', 'money', 'smallmoney')
+                         THEN c.precision END AS NUMERIC_PRECISION,
+                    CASE WHEN ty.name IN ('tinyint', 'smallint', 'int', 'bigint', 'decimal', 'numeric',
+                                          'money', 'smallmoney')
+                         THEN c.scale END AS NUMERIC_SCALE,
+                    CASE WHEN ty.name IN ('datetime2', 'datetimeoffset', 'time') THEN c.scale
+                         WHEN ty.name = 'datetime' THEN 3
+                         WHEN ty.name IN ('date', 'smalldatetime') THEN 0
+                    END AS DATETIME_PRECISION
+                FROM sys.tables t
+                JOIN sys.columns c ON c.object_id = t.object_id
+                JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+                """
+                
+                params = []
+                if table_pattern:
+                    schema_query += " WHERE t.name LIKE ?"
+                    params.append(table_pattern)
+                
+                schema_query += " ORDER BY t.name, c.column_id"
+                
+                logger.info("Fetching data dictionary...")
+                cursor.execute(schema_query, params)
+                
+                # Stream the results in arraysize batches rather than
+                # holding every row at once
+                rows = chain.from_iterable(iter(cursor.fetchmany, []))
+                
+                # Rows are ordered by table, so each table's columns are one
+                # contiguous run
+                # Cached results live for SCHEMA_CACHE_TTL, so the few distinct
+                # type and schema names are interned and shared by every column
+                # instead of each row carrying its own copy
+                tables = {}
+                for table_name, group in groupby(rows, key=_table_name):
+                    group = list(group)
+                    first = group[0]
+                    if columnar:
+                        fields = list(zip(*group))
+                        columns = {name: list(fields[index]) for name, index in _SCHEMA_SOA_FIELDS}
+                        columns["is_nullable"] = [bool(value) for value in columns["is_nullable"]]
+                        columns["data_types"] = [sys.intern(value) for value in columns["data_types"]]
+                    else:
+                        columns = [
+                            {
+                                "name": row.COLUMN_NAME,
+                                "position": row.ORDINAL_POSITION,
+                                "data_type": sys.intern(row.DATA_TYPE),
+                                "is_nullable": bool(row.IS_NULLABLE),
+                                "default_value": row.COLUMN_DEFAULT,
+                                "max_length": row.CHARACTER_MAXIMUM_LENGTH,
+                                "numeric_precision": row.NUMERIC_PRECISION,
+                                "numeric_scale": row.NUMERIC_SCALE,
+                                "datetime_precision": row.DATETIME_PRECISION
+                            }
+                            for row in group
+                        ]
                     tables[table_name] = {
-                        "catalog": row.TABLE_CATALOG,
-                        "schema": row.TABLE_SCHEMA,
-                        "table_type": row.TABLE_TYPE,
-                        "columns": []
+                        "catalog": first.TABLE_CATALOG,
+                        "schema": sys.intern(first.TABLE_SCHEMA),
+                        "table_type": first.TABLE_TYPE,
+                        "columns": columns
                     }
                 
-                if row.COLUMN_NAME:  # Some tables might not have columns in the result
-                    column_info = {
-                        "name": row.COLUMN_NAME,
-                        "position": row.ORDINAL_POSITION,
-                        "data_type": row.DATA_TYPE,
-                        "is_nullable": row.IS_NULLABLE == "YES",
-                        "default_value": row.COLUMN_DEFAULT,
-                        "max_length": row.CHARACTER_MAXIMUM_LENGTH,
-                        "numeric_precision": row.NUMERIC_PRECISION,
-                        "numeric_scale": row.NUMERIC_SCALE,
-                        "datetime_precision": row.DATETIME_PRECISION
-                    }
-                    tables[table_name]["columns"].append(column_info)
-            
-            cursor.close()
-            
-            return {
-                "success": True,
-                "table_count": len(tables),
-                "tables": tables,
-                "generated_at": "2025-01-01T00:00:00Z"
-            }
+                result = {
+                    "success": True,
+                    "table_count": len(tables),
+                    "tables": tables,
+                    "generated_at": "2025-01-01T00:00:00Z"
+                }
+                if SCHEMA_CACHE_TTL > 0:
+                    with self._schema_cache_lock:
+                        self._schema_cache.pop(cache_key, None)
+                        self._schema_cache[cache_key] = (time.monotonic(), result)
+                        if len(self._schema_cache) > SCHEMA_CACHE_SIZE:
+                            del self._schema_cache[next(iter(self._schema_cache))]
+                return result
             
         except Exception as e:
             logger.error(f"Error fetching data dictionary: {e}")
@@ -221,89 +671,87 @@ class P21Server:
                 "error": str(e)
             }
 
-    def execute_sql(self, sql_query: str, limit: int = 1000) -> Dict[str, Any]:
-        """Execute arbitrary SQL query."""
+    def invalidate_schema_cache(self) -> Dict[str, Any]:
+        """Drop cached data dictionaries so the next call rereads the catalog.
+
+        With several uvicorn workers, the others drop theirs on their next
+        data dictionary call (see SCHEMA_STAMP_FILE); "cleared" counts only
+        this worker's entries.
+        """
+        with self._schema_cache_lock:
+            cleared = len(self._schema_cache)
+            self._schema_cache.clear()
+            if SCHEMA_STAMP_FILE:
+                with open(SCHEMA_STAMP_FILE, 'a'):
+                    pass
+                now = time.time_ns()
+                os.utime(SCHEMA_STAMP_FILE, ns=(now, now))
+                self._schema_stamp = _schema_stamp()
+        logger.info(f"Cleared {cleared} cached data dictionaries")
+        return {
+            "success": True,
+            "cleared": cleared
+        }
+
+    def execute_sql(self, sql_query: str, limit: int = 1000,
+                    result_format: str = "aos") -> Dict[str, Any]:
+        """Execute arbitrary SQL query.
+
+        result_format "aos" returns "data" as one dict per row; "soa" returns
+        "rows" as value lists in "columns" order, without repeating the column
+        names in every row.
+        """
+        columnar = result_format == "soa"
         start_time = time.time()
         try:
-            logger.info(f"Starting SQL execution: {sql_query}")
-            
-            # Add basic security check for dangerous operations
-            sql_upper = sql_query.upper().strip()
-            dangerous_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'INSERT', 'UPDATE', 'ALTER', 'CREATE']
-            
-            # Allow only SELECT statements for safety
-            if not sql_upper.startswith('SELECT'):
-                return {
-                    "success": False,
-                    "error": "Only SELECT statements are allowed for security reasons",
-                    "query": sql_query
-                }
-            
-            # Check for dangerous keywords in SELECT statements
-            for keyword in dangerous_keywords:
-                if keyword in sql_upper:
-                    return {
-                        "success": False,
-                        "error": f"SQL contains potentially dangerous keyword: {keyword}",
-                        "query": sql_query
-                    }
+            logger.debug("Starting SQL execution: %s", sql_query)
             
-            # Handle sandboxed tables for testing/simulation
-            if 'mcp_sandboxed_inv' in sql_query.lower():
+            rejected = _rejected_sql(sql_query)
+            if rejected:
                 return {
                     "success": False,
-                    "error": "Connection to MCP Sandbox failed: Network timeout.",
+                    "error": rejected,
                     "query": sql_query
                 }
             
-            logger.info(f"Getting database connection...")
-            conn = self.get_connection()
-            logger.info(f"Got connection, creating cursor...")
-            cursor = conn.cursor()
-            
-            logger.info(f"Executing SQL query: {sql_query}")
-            cursor.execute(sql_query)
-            logger.info(f"Query executed, fetching results...")
-            
-            # Get column names
-            columns = [column[0] for column in cursor.description] if cursor.description else []
-            
-            # Fetch results with limit
-            if limit:
-                rows = cursor.fetchmany(limit)
+            logger.debug("Getting database connection...")
+            if USE_TURBODBC:
+                with self.acquire_turbodbc() as conn:
+                    cursor = conn.cursor()
+                    logger.debug("Executing SQL query: %s", sql_query)
+                    cursor.execute(sql_query)
+                    columns = [column[0] for column in cursor.description] if cursor.description else []
+                    data = _fetch_turbodbc_rows(cursor, limit, columnar)
+                    cursor.close()
             else:
-                rows = cursor.fetchall()
+                with self.acquire() as conn:
+                    logger.debug("Got connection, creating cursor...")
+                    cursor = conn.cursor()
+                    cursor.arraysize = FETCH_BATCH_SIZE
+                    
+                    logger.debug("Executing SQL query: %s", sql_query)
+                    cursor.execute(sql_query)
+                    logger.debug("Query executed, fetching results...")
+                    
+                    columns = [column[0] for column in cursor.description] if cursor.description else []
+                    data = []
+                    if cursor.description:
+                        for batch in _converted_batches(cursor, limit, columnar):
+                            data.extend(batch)
+                    
+                    cursor.close()
             
-            logger.info(f"Fetched {len(rows)} rows, processing data...")
-            
-            # Convert rows to list of dictionaries
-            data = []
-            for row in rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    column_name = columns[i] if i < len(columns) else f"column_{i}"
-                    # Handle Decimal and other non-JSON serializable types
-                    if hasattr(value, '__float__'):
-                        row_dict[column_name] = float(value)
-                    elif hasattr(value, '__int__'):
-                        row_dict[column_name] = int(value)
-                    elif value is None:
-                        row_dict[column_name] = None
-                    else:
-                        row_dict[column_name] = str(value)
-                data.append(row_dict)
-            
-            cursor.close()
+            logger.debug("Fetched %d rows", len(data))
             elapsed = time.time() - start_time
-            logger.info(f"SQL execution completed in {elapsed:.2f} seconds")
+            logger.debug("SQL execution completed in %.2f seconds", elapsed)
             
             return {
                 "success": True,
                 "row_count": len(data),
                 "columns": columns,
-                "data": data,
+                "rows" if columnar else "data": data,
                 "query": sql_query,
-                "limited": limit is not None and len(rows) == limit,
+                "limited": bool(limit) and len(data) == limit,
                 "execution_time": elapsed
             }
             
@@ -317,121 +765,547 @@ class P21Server:
                 "execution_time": elapsed
             }
 
+    def stream_sql(self, sql_query: str, limit: Optional[int] = None, columnar: bool = False):
+        """Execute a SELECT and yield its result a batch at a time.
+
+        The first item is the column list, followed by one list of rows per
+        fetchmany batch (see _converted_batches), so only a single batch is
+        held in memory. Raises ValueError for SQL execute_sql would refuse.
+        The connection goes back to the pool when the generator is
+        exhausted or closed.
+        """
+        rejected = _rejected_sql(sql_query)
+        if rejected:
+            raise ValueError(rejected)
+
+        conn = self.get_connection()
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.arraysize = FETCH_BATCH_SIZE
+            logger.debug("Streaming query: %s", sql_query)
+            cursor.execute(sql_query)
+            if not cursor.description:
+                yield []
+                return
+            yield [column[0] for column in cursor.description]
+            yield from _converted_batches(cursor, limit, columnar)
+        except Exception as e:
+            if _is_disconnect(e):
+                self.discard_connection(conn)
+                conn = None
+            raise
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            if conn is not None:
+                self.close_connection(conn)
+
+def _json_default(value):
+    """orjson fallback for the driver types it can't serialize natively.
+
+    Decimal columns become floats and anything else is stringified.
+    """
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
 # Global server instance
 p21_server = P21Server()
 
+# Tool name -> (P21Server method, ((request argument, keyword, default), ...))
+_TOOLS = {
+    'read_table_column': (p21_server.read_table_column, (
+        ('table_name', 'table_name', None),
+        ('column_name', 'column_name', None),
+        ('where_clause', 'where_clause', None),
+        ('limit', 'limit', 100),
+        ('where_params', 'where_params', None),
+    )),
+    'get_data_dictionary': (p21_server.get_data_dictionary, (
+        ('table_pattern', 'table_pattern', None),
+        ('format', 'result_format', 'aos'),
+    )),
+    'invalidate_schema_cache': (p21_server.invalidate_schema_cache, ()),
+    'execute_sql': (p21_server.execute_sql, (
+        ('sql_query', 'sql_query', None),
+        ('limit', 'limit', 1000),
+        ('format', 'result_format', 'aos'),
+    )),
+}
+
+def _call_tool(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a /call_tool request on the calling thread and return its result."""
+    try:
+        method, parameters = _TOOLS[tool_name]
+    except KeyError:
+        return {
+            "success": False,
+            "error": f"Unknown tool: {tool_name}"
+        }
+    return method(**{
+        keyword: arguments.get(argument, default)
+        for argument, keyword, default in parameters
+    })
+
+# Each request gets its own thread; the database work itself runs on this
+# executor so at most max_pool_size queries are in flight, one per pooled
+# connection, while serialization and socket I/O overlap with them.
+db_executor = ThreadPoolExecutor(max_workers=p21_server.max_pool_size, thread_name_prefix='p21-db')
+
+def _invalid_batch(calls) -> Optional[Dict[str, Any]]:
+    """Return the error result for a malformed batch, or None if it is valid."""
+    if not isinstance(calls, list) or not all(isinstance(call, dict) for call in calls):
+        return {
+            "success": False,
+            "error": "batch must be a list of {name, arguments} objects"
+        }
+    return None
+
+def _timed_out() -> Dict[str, Any]:
+    return {
+        "success": False,
+        "error": f"Tool call timed out after {TOOL_TIMEOUT:g} seconds"
+    }
+
+def _batch_result(results: List[Dict[str, Any]], start_time: float) -> Dict[str, Any]:
+    return {
+        "success": all(result.get("success") for result in results),
+        "count": len(results),
+        "results": results,
+        "execution_time": time.time() - start_time
+    }
+
+def _call_batch(calls) -> Dict[str, Any]:
+    """Run a list of {name, arguments} tool calls concurrently.
+
+    Each call is submitted to db_executor, so up to max_pool_size run at once
+    on separate pooled connections and the batch takes roughly as long as
+    its slowest call. Results keep the order of the request.
+    """
+    invalid = _invalid_batch(calls)
+    if invalid:
+        return invalid
+
+    start_time = time.time()
+    deadline = time.monotonic() + TOOL_TIMEOUT
+    futures = [
+        db_executor.submit(_call_tool, call.get('name'), call.get('arguments') or {})
+        for call in calls
+    ]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=max(deadline - time.monotonic(), 0)))
+        except FutureTimeoutError:
+            results.append(_timed_out())
+    return _batch_result(results, start_time)
+
+async def _call_batch_async(calls) -> Dict[str, Any]:
+    """_call_batch for the ASGI app: the event loop awaits the db_executor
+    futures itself instead of parking a thread on them."""
+    invalid = _invalid_batch(calls)
+    if invalid:
+        return invalid
+
+    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    futures = [
+        loop.run_in_executor(db_executor, _call_tool, call.get('name'), call.get('arguments') or {})
+        for call in calls
+    ]
+    if futures:
+        await asyncio.wait(futures, timeout=TOOL_TIMEOUT)
+    results = [future.result() if future.done() else _timed_out() for future in futures]
+    return _batch_result(results, start_time)
+
+# Constant response header blocks, encoded once; responses are written as
+# one bytes join instead of a send_header call per line
+_STATUS_LINES = {
+    200: b' 200 OK\r\n',
+    500: b' 500 Internal Server Error\r\n',
+    504: b' 504 Gateway Timeout\r\n',
+}
+_CORS_HEADERS = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, PUT, DELETE, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: *\r\n'
+    b'Access-Control-Max-Age: 86400\r\n'
+)
+_JSON_HEADERS = b'Content-Type: application/json\r\n' + _CORS_HEADERS
+_NDJSON_HEADERS = b'Content-Type: application/x-ndjson\r\n' + _CORS_HEADERS
+_PREFLIGHT_RESPONSE = b'HTTP/1.1 200 OK\r\n' + _CORS_HEADERS + b'Content-Length: 0\r\n\r\n'
+
+# Bodies that never change are encoded once; request errors only splice the
+# encoded message into a fixed envelope
+_HEALTH_RESPONSE = orjson.dumps({
+    "status": "healthy",
+    "server": "P21 HTTP MCP Server",
+    "endpoints": ["/call_tool"],
+    "methods": ["POST", "OPTIONS"],
+    "timestamp": "2025-01-01T00:00:00Z"
+})
+_ERROR_TEMPLATE = b'{"success":false,"error":%s}'
+
+def _error_body(message: str) -> bytes:
+    """Encode a request-level error response body."""
+    return _ERROR_TEMPLATE % orjson.dumps(message)
+
+# /call_tool results at least this large are compressed when the client
+# accepts it; smaller ones fit in a packet or two and aren't worth the CPU.
+# Low levels keep most of the ratio on repetitive JSON for a fraction of the
+# time of the defaults.
+COMPRESS_MIN_SIZE = 1024
+_COMPRESSORS: Dict[bytes, Callable[[bytes], bytes]] = {
+    b'gzip': lambda body: gzip.compress(body, compresslevel=1),
+}
+if brotli is not None:
+    _COMPRESSORS[b'br'] = lambda body: brotli.compress(body, quality=4)
+
+def _accepted_encoding(accept_encoding: Optional[str], streaming: bool = False) -> Optional[bytes]:
+    """Pick br or gzip from an Accept-Encoding header, or None for identity.
+
+    Codings sent with q=0 are refused by the client and never picked (RFC 9110
+    section 12.5.3). Streamed bodies are only gzipped, one flushed deflate
+    block per chunk.
+    """
+    if not accept_encoding:
+        return None
+    offered = set()
+    for token in accept_encoding.split(','):
+        coding, *params = token.split(';')
+        refused = False
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    refused = float(value) <= 0
+                except ValueError:
+                    refused = True
+        if not refused:
+            offered.add(coding.strip().lower())
+    if 'br' in offered and b'br' in _COMPRESSORS and not streaming:
+        return b'br'
+    if 'gzip' in offered:
+        return b'gzip'
+    return None
+
+def _gzip_chunks(pieces):
+    """Gzip an iterable of byte strings, flushing after each so every chunk
+    is sent as soon as it is produced."""
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 31)
+    for piece in pieces:
+        yield compressor.compress(piece) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def _ndjson_body(columns, batches, start_time):
+    """Encode a streamed result as NDJSON, one chunk per batch.
+
+    The first line is {"columns": [...]}, then one line per row; a final
+    line carries success, row_count and execution_time, so a failure
+    mid-stream can still be reported.
+    """
+    yield orjson.dumps({"columns": columns}, option=orjson.OPT_APPEND_NEWLINE)
+    row_count = 0
+    tail = {"success": True}
+    try:
+        for rows in batches:
+            if rows:
+                yield b''.join(orjson.dumps(row, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+                               for row in rows)
+                row_count += len(rows)
+    except Exception as e:
+        logger.error(f"Streaming failed after {row_count} rows: {e}")
+        tail = {"success": False, "error": str(e)}
+    finally:
+        batches.close()
+    tail["row_count"] = row_count
+    tail["execution_time"] = time.time() - start_time
+    yield orjson.dumps(tail, option=orjson.OPT_APPEND_NEWLINE)
+
 class RequestHandler(BaseHTTPRequestHandler):
+    # Every response carries Content-Length, so clients can keep the
+    # connection open across dashboard requests
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, body, compressible=False):
+        """Write status line, headers and body in a single write.
+
+        compressible bodies are compressed per the request's Accept-Encoding
+        once they reach COMPRESS_MIN_SIZE.
+        """
+        encoding_headers = b''
+        if compressible:
+            encoding_headers = b'Vary: Accept-Encoding\r\n'
+            encoding = _accepted_encoding(self.headers.get('Accept-Encoding'))
+            if encoding and len(body) >= COMPRESS_MIN_SIZE:
+                body = _COMPRESSORS[encoding](body)
+                encoding_headers += b'Content-Encoding: %s\r\n' % encoding
+        self.log_request(status, len(body))
+        self.wfile.write(b''.join((
+            self.protocol_version.encode('ascii'),
+            _STATUS_LINES[status],
+            _JSON_HEADERS,
+            encoding_headers,
+            b'Connection: close\r\n' if self.close_connection else b'',
+            b'Content-Length: %d\r\n\r\n' % len(body),
+            body,
+        )))
+
+    def _send_stream(self, pieces):
+        """Write a chunked response whose body is produced piece by piece,
+        gzipped on the fly when the client accepts it."""
+        encoding = _accepted_encoding(self.headers.get('Accept-Encoding'), streaming=True)
+        if encoding:
+            pieces = _gzip_chunks(pieces)
+        self.log_request(200)
+        self.wfile.write(b''.join((
+            self.protocol_version.encode('ascii'),
+            _STATUS_LINES[200],
+            _NDJSON_HEADERS,
+            b'Vary: Accept-Encoding\r\n',
+            b'Content-Encoding: gzip\r\n' if encoding else b'',
+            b'Transfer-Encoding: chunked\r\n\r\n',
+        )))
+        for piece in pieces:
+            if not piece:
+                continue  # a zero-length chunk would end the body early
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(piece), piece))
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _stream_sql(self, arguments):
+        """Run execute_sql with stream set, writing rows as they are fetched.
+
+        Runs on the request thread rather than db_executor: the connection is
+        held for as long as the client takes to read, and a slow reader should
+        not occupy one of the executor's slots.
+        """
+        start_time = time.time()
+        batches = p21_server.stream_sql(arguments.get('sql_query'), limit=arguments.get('limit'),
+                                        columnar=arguments.get('format') == 'soa')
+        try:
+            columns = next(batches)
+        except Exception as e:
+            logger.error(f"Streaming query failed: {e}")
+            self._send_json(200, orjson.dumps({
+                "success": False,
+                "error": str(e),
+                "execution_time": time.time() - start_time
+            }))
+            return
+        self._send_stream(_ndjson_body(columns, batches, start_time))
+
     def do_POST(self):
-        logger.info(f"Received POST request to {self.path}")
+        logger.debug("Received POST request to %s", self.path)
         if self.path == '/call_tool':
             try:
-                logger.info("Processing /call_tool request")
+                logger.debug("Processing /call_tool request")
                 content_length = int(self.headers['Content-Length'])
                 post_data = self.rfile.read(content_length)
-                request_data = json.loads(post_data.decode('utf-8'))
+                request_data = orjson.loads(post_data)
                 
-                tool_name = request_data.get('name')
-                arguments = request_data.get('arguments', {})
-                logger.info(f"Tool: {tool_name}, Args: {arguments}")
+                if request_data.get('name') == 'execute_sql' and (request_data.get('arguments') or {}).get('stream'):
+                    self._stream_sql(request_data['arguments'])
+                    return
                 
-                if tool_name == 'read_table_column':
-                    result = p21_server.read_table_column(
-                        table_name=arguments.get('table_name'),
-                        column_name=arguments.get('column_name'),
-                        where_clause=arguments.get('where_clause'),
-                        limit=arguments.get('limit', 100)
-                    )
-                elif tool_name == 'get_data_dictionary':
-                    result = p21_server.get_data_dictionary(
-                        table_pattern=arguments.get('table_pattern')
-                    )
-                elif tool_name == 'execute_sql':
-                    logger.info("Executing SQL tool")
-                    result = p21_server.execute_sql(
-                        sql_query=arguments.get('sql_query'),
-                        limit=arguments.get('limit', 1000)
-                    )
+                if 'batch' in request_data:
+                    # A dashboard refresh's tile queries in one request
+                    logger.debug("Processing batch of tool calls")
+                    result = _call_batch(request_data['batch'])
                 else:
-                    result = {
-                        "success": False,
-                        "error": f"Unknown tool: {tool_name}"
-                    }
+                    tool_name = request_data.get('name')
+                    arguments = request_data.get('arguments', {})
+                    logger.debug("Tool: %s, Args: %s", tool_name, arguments)
+                    
+                    result = db_executor.submit(_call_tool, tool_name, arguments).result(
+                        timeout=TOOL_TIMEOUT)
                 
-                logger.info(f"Tool execution completed, sending response")
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-                self.send_header('Access-Control-Allow-Headers', '*')
-                self.send_header('Access-Control-Max-Age', '86400')
-                self.end_headers()
-                
-                response = json.dumps(result, indent=2).encode('utf-8')
-                self.wfile.write(response)
-                logger.info("Response sent successfully")
+                logger.debug("Tool execution completed, sending response")
+                response = orjson.dumps(result, default=_json_default)
+                self._send_json(200, response, compressible=True)
+                logger.debug("Response sent successfully")
                 
+            except FutureTimeoutError:
+                logger.error(f"Tool call timed out after {TOOL_TIMEOUT:g}s")
+                self._send_json(504, _error_body(f"Tool call timed out after {TOOL_TIMEOUT:g} seconds"))
             except Exception as e:
                 logger.error(f"Error handling request: {e}")
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                error_response = json.dumps({"success": False, "error": str(e)}).encode('utf-8')
-                self.wfile.write(error_response)
+                self.close_connection = True
+                self._send_json(500, _error_body(str(e)))
         else:
-            logger.info(f"Unknown path: {self.path}")
+            logger.debug("Unknown path: %s", self.path)
+            # The request body was never read, so the connection can't be reused
             self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.send_header('Connection', 'close')
             self.end_headers()
     
     def do_OPTIONS(self):
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', '*')
-        self.send_header('Access-Control-Max-Age', '86400')
-        self.end_headers()
+        self.log_request(200)
+        self.wfile.write(_PREFLIGHT_RESPONSE)
 
     def do_GET(self):
-        logger.info(f"Received GET request to {self.path}")
+        logger.debug("Received GET request to %s", self.path)
         if self.path.startswith('/?'):
             # Health check or simple query
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', '*')
-            self.end_headers()
-
-            health_response = json.dumps({
-                "status": "healthy",
-                "server": "P21 HTTP MCP Server",
-                "endpoints": ["/call_tool"],
-                "methods": ["POST", "OPTIONS"],
-                "timestamp": "2025-01-01T00:00:00Z"
-            }).encode('utf-8')
-            self.wfile.write(health_response)
+            self._send_json(200, _HEALTH_RESPONSE)
         else:
             self.send_response(404)
             self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', '0')
             self.end_headers()
     
     def log_message(self, format, *args):
         # Suppress default HTTP server logging
         pass
 
+# The same endpoints as RequestHandler as a bare ASGI app, served by uvicorn
+# when USE_UVICORN: the event loop parses HTTP and holds idle keep-alive
+# connections, and only the pyodbc work occupies db_executor threads
+_ASGI_CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'GET, POST, PUT, DELETE, OPTIONS'),
+    (b'access-control-allow-headers', b'*'),
+    (b'access-control-max-age', b'86400'),
+]
+_ASGI_JSON_HEADERS = [(b'content-type', b'application/json')] + _ASGI_CORS_HEADERS
+
+async def _asgi_respond(send, status: int, body: bytes = b'', headers=_ASGI_JSON_HEADERS):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [*headers, (b'content-length', b'%d' % len(body))],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+def _asgi_accept_encoding(scope) -> str:
+    return next((value for name, value in scope["headers"] if name == b'accept-encoding'), b'').decode('latin-1')
+
+def _asgi_json_headers(scope, body: bytes):
+    """Compress body per the request's Accept-Encoding; return (headers, body)."""
+    encoding = _accepted_encoding(_asgi_accept_encoding(scope))
+    headers = [*_ASGI_JSON_HEADERS, (b'vary', b'Accept-Encoding')]
+    if encoding and len(body) >= COMPRESS_MIN_SIZE:
+        body = _COMPRESSORS[encoding](body)
+        headers.append((b'content-encoding', encoding))
+    return headers, body
+
+async def _asgi_stream_sql(scope, send, arguments):
+    """ASGI counterpart of RequestHandler._stream_sql: NDJSON sent as
+    more_body messages as batches are fetched.
+
+    The blocking generator is stepped on a worker thread of its own, so its
+    cursor is only ever touched by one thread, and the event loop stays free
+    while it fetches.
+    """
+    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='p21-stream') as worker:
+        batches = p21_server.stream_sql(arguments.get('sql_query'), limit=arguments.get('limit'),
+                                        columnar=arguments.get('format') == 'soa')
+        try:
+            columns = await loop.run_in_executor(worker, next, batches)
+        except Exception as e:
+            logger.error(f"Streaming query failed: {e}")
+            await _asgi_respond(send, 200, orjson.dumps({
+                "success": False,
+                "error": str(e),
+                "execution_time": time.time() - start_time
+            }))
+            return
+
+        pieces = _ndjson_body(columns, batches, start_time)
+        headers = [(b'content-type', b'application/x-ndjson'), *_ASGI_CORS_HEADERS,
+                   (b'vary', b'Accept-Encoding')]
+        if _accepted_encoding(_asgi_accept_encoding(scope), streaming=True):
+            pieces = _gzip_chunks(pieces)
+            headers.append((b'content-encoding', b'gzip'))
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            while True:
+                piece = await loop.run_in_executor(worker, next, pieces, None)
+                if piece is None:
+                    break
+                if piece:
+                    await send({"type": "http.response.body", "body": piece, "more_body": True})
+            await send({"type": "http.response.body", "body": b''})
+        finally:
+            # Returns the connection to the pool if the client went away
+            await loop.run_in_executor(worker, pieces.close)
+
+async def app(scope, receive, send):
+    """ASGI entry point (uvicorn p21_http_server:app)."""
+    if scope["type"] != "http":
+        return
+    method, path = scope["method"], scope["path"]
+
+    if method == "OPTIONS":
+        await _asgi_respond(send, 200, headers=_ASGI_CORS_HEADERS)
+    elif method == "GET" and path == "/" and scope["query_string"]:
+        await _asgi_respond(send, 200, _HEALTH_RESPONSE)
+    elif method == "POST" and path == "/call_tool":
+        try:
+            body = bytearray()
+            while True:
+                message = await receive()
+                body += message.get("body", b"")
+                if not message.get("more_body"):
+                    break
+            request_data = orjson.loads(body)
+            if request_data.get('name') == 'execute_sql' and (request_data.get('arguments') or {}).get('stream'):
+                await _asgi_stream_sql(scope, send, request_data['arguments'])
+                return
+            if 'batch' in request_data:
+                result = await _call_batch_async(request_data['batch'])
+            else:
+                tool_name = request_data.get('name')
+                arguments = request_data.get('arguments', {})
+                logger.debug("Tool: %s, Args: %s", tool_name, arguments)
+                result = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(db_executor, _call_tool, tool_name, arguments),
+                    TOOL_TIMEOUT)
+            headers, body = _asgi_json_headers(scope, orjson.dumps(result, default=_json_default))
+            await _asgi_respond(send, 200, body, headers)
+        except asyncio.TimeoutError:
+            logger.error(f"Tool call timed out after {TOOL_TIMEOUT:g}s")
+            await _asgi_respond(send, 504, _error_body(f"Tool call timed out after {TOOL_TIMEOUT:g} seconds"))
+        except Exception as e:
+            logger.error(f"Error handling request: {e}")
+            await _asgi_respond(send, 500, _error_body(str(e)))
+    else:
+        await _asgi_respond(send, 404, headers=[])
+
 def main():
     # Set environment variable for this process
     os.environ['P21_DSN'] = 'P21live'
     
     try:
-        # Setup P21 connection
-        p21_server.setup_connection()
+        # Setup P21 connection. A multi-worker uvicorn supervisor never serves
+        # requests, so it skips the probe; each worker connects on first use.
+        if not (USE_UVICORN and UVICORN_WORKERS > 1):
+            p21_server.setup_connection()
+        
+        if USE_UVICORN:
+            logger.info(f"P21 HTTP MCP Server running on http://localhost:8001 "
+                        f"(uvicorn, {UVICORN_WORKERS} worker(s))")
+            # Worker processes import the app themselves, so uvicorn needs it
+            # by name; each opens its pool on first request
+            target = "p21_http_server:app" if UVICORN_WORKERS > 1 else app
+            uvicorn.run(target, host="localhost", port=8001, workers=UVICORN_WORKERS,
+                        app_dir=os.path.dirname(os.path.abspath(__file__)),
+                        loop="auto", http="auto", lifespan="off", log_level="warning")
+            return
         
         # Try different ports if 8001 is busy
         port = 8001
         for attempt in range(10):
             try:
                 server_address = ('localhost', port)
-                httpd = HTTPServer(server_address, RequestHandler)
+                httpd = ThreadingHTTPServer(server_address, RequestHandler)
                 logger.info(f"P21 HTTP MCP Server running on http://localhost:{port}")
                 httpd.serve_forever()
                 break
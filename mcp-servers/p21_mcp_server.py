@@ -4,18 +4,33 @@ P21 MCP Server
 Using Model Context Protocol to provide SQL query access to P21 database
 """
 
-import json
+import asyncio
+import base64
+import decimal
+import gzip
+import hashlib
 import logging
+import operator
 import os
+import queue
+import re
 import sys
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import pyodbc
 from mcp import Tool
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
+    BlobResourceContents,
+    EmbeddedResource,
     EmptyResult,
     GetPromptResult,
     Prompt,
@@ -35,149 +50,405 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Let the ODBC driver manager pool physical connections, so replacing a
+# dropped connection doesn't pay a full login. Must be set before connecting.
+pyodbc.pooling = True
+
+# SQLSTATEs meaning the connection itself is gone (communication link
+# failure, connection not open, unable to connect, timeout expired)
+_DISCONNECT_SQLSTATES = frozenset({'08S01', '08003', '08001', 'HYT00'})
+
+def _is_disconnect(error: Exception) -> bool:
+    """True if a pyodbc error means the connection should be thrown away."""
+    return (isinstance(error, pyodbc.Error) and bool(error.args)
+            and error.args[0] in _DISCONNECT_SQLSTATES)
+
+# Rows pulled per ODBC round-trip. pyodbc's default arraysize is 1; larger
+# batches cut round-trips at the cost of ~FETCH_ARRAYSIZE * row size memory.
+FETCH_ARRAYSIZE = 5000
+
+_first_column = operator.itemgetter(0)
+
+# With P21_COMPRESS_RESULTS=1, tool results with more JSON than this are
+# returned as a gzipped blob resource (see _tool_content). Off by default:
+# generic MCP hosts, and clients that read content[0].text, only handle text.
+COMPRESS_RESULTS = os.getenv("P21_COMPRESS_RESULTS") == "1"
+COMPRESS_THRESHOLD = 64 * 1024
+
+# Schema changes rarely, so data dictionary lookups are answered from memory
+# for this many seconds before INFORMATION_SCHEMA is queried again
+SCHEMA_CACHE_TTL = float(os.getenv("P21_SCHEMA_TTL", "600"))
+# INFORMATION_SCHEMA.COLUMNS rows read per data dictionary query
+SCHEMA_PAGE_SIZE = FETCH_ARRAYSIZE
+# table_names entries bound per data dictionary query; SQL Server accepts at
+# most 2100 parameters and the pattern and OFFSET/FETCH take three more
+MAX_TABLE_NAMES = 2000
+
+# Dashboards poll the same SELECTs every refresh; successful execute_sql
+# results are reused for this many seconds (0 disables the cache)
+QUERY_CACHE_TTL = float(os.getenv("P21_QUERY_CACHE_TTL", "30"))
+QUERY_CACHE_SIZE = 256
+
+def _load_metrics() -> Dict[str, Tuple[str, float]]:
+    """Read dashboard KPI definitions from the JSON file named by P21_METRICS_FILE.
+
+    The file maps metric name -> {"sql": "...", "refresh_seconds": 60}.
+    """
+    path = os.getenv("P21_METRICS_FILE")
+    if not path:
+        return {}
+    try:
+        with open(path, 'rb') as f:
+            spec = orjson.loads(f.read())
+        return {name: (entry["sql"], float(entry.get("refresh_seconds", 60)))
+                for name, entry in spec.items()}
+    except Exception as e:
+        logger.error(f"Could not load metrics from {path}: {e}")
+        return {}
+
+# execute_sql safety check, compiled once: the statement must start with
+# SELECT or WITH, and may not contain a data- or schema-changing keyword
+_SELECT_RE = re.compile(r'\s*(?:WITH|SELECT)\b', re.IGNORECASE)
+_UNSAFE_RE = re.compile(
+    r'\b(?:DROP|DELETE|TRUNCATE|INSERT|UPDATE|ALTER|CREATE|EXEC|EXECUTE|MERGE|GRANT|REVOKE)\b',
+    re.IGNORECASE
+)
+
+# Tokens that matter when placing TOP: string literals, bracketed names and
+# comments are matched whole so keywords inside them are ignored
+_TOP_TOKEN_RE = re.compile(
+    r"'(?:[^']|'')*'|\[[^\]]*\]|--[^\n]*|/\*.*?\*/|[()]"
+    r"|\b(?:SELECT|DISTINCT|ALL|TOP|OFFSET|UNION|INTERSECT|EXCEPT)\b",
+    re.IGNORECASE | re.DOTALL
+)
+
+def _inject_top(sql_query: str) -> Optional[str]:
+    """Return sql_query with TOP (?) after its outermost SELECT, or None.
+
+    The outermost SELECT is the first one outside parentheses, which skips
+    CTE bodies. None means the query is left alone: it already has TOP, pages
+    with OFFSET/FETCH, or combines result sets (a TOP would only cut the first).
+    """
+    depth = 0
+    insert_at = None
+    after_select = False
+    for token in _TOP_TOKEN_RE.finditer(sql_query):
+        word = token.group().upper()
+        if word == '(':
+            depth += 1
+        elif word == ')':
+            depth -= 1
+        elif depth == 0 and word[0] not in "'[-/":
+            # TOP goes after SELECT [DISTINCT | ALL]; an existing TOP there wins
+            if after_select and not sql_query[insert_at:token.start()].strip():
+                if word == 'TOP':
+                    return None
+                if word in ('DISTINCT', 'ALL'):
+                    insert_at = token.end()
+                    continue
+            after_select = False
+            if word == 'SELECT' and insert_at is None:
+                insert_at = token.end()
+                after_select = True
+            elif word in ('OFFSET', 'UNION', 'INTERSECT', 'EXCEPT'):
+                return None
+    if insert_at is None:
+        return None
+    return f"{sql_query[:insert_at]} TOP (?){sql_query[insert_at:]}"
+
+def _json_default(value):
+    """Convert values orjson has no native encoding for (Decimal -> float, else str)."""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result or resource body for an MCP text payload."""
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+def _tool_content(result: Dict[str, Any]) -> List[Any]:
+    """Wrap a tool result as MCP content.
+
+    Results are sent as indented JSON text. When COMPRESS_RESULTS is set,
+    ones over COMPRESS_THRESHOLD bytes (full data dictionaries, big result
+    sets) are sent instead as a gzipped JSON blob resource, a fraction of
+    the size on the stdio pipe. The result is serialized once either way.
+    """
+    payload = orjson.dumps(result, default=_json_default, option=orjson.OPT_INDENT_2)
+    if not COMPRESS_RESULTS or len(payload) <= COMPRESS_THRESHOLD:
+        return [TextContent(type="text", text=payload.decode('utf-8'))]
+
+    blob = gzip.compress(payload, compresslevel=1)
+    return [EmbeddedResource(
+        type="resource",
+        resource=BlobResourceContents(
+            uri=f"p21://results/{hashlib.blake2b(blob, digest_size=8).hexdigest()}",
+            mimeType="application/json+gzip",
+            blob=base64.b64encode(blob).decode('ascii')
+        )
+    )]
+
 class P21Database:
     """P21 Database operations."""
 
     def __init__(self):
         self.dsn = os.getenv("P21_DSN", "P21live").strip()
         self.connection_string = None
-        self._connection_pool: List[Any] = []
-        self.max_pool_size = 3
+        # At most max_pool_size connections are checked out at once; callers
+        # beyond that wait for one to be returned. Idle connections are kept
+        # LIFO so the most recently used one is reused first.
+        self.max_pool_size = int(os.getenv("P21_POOL_SIZE", "8"))
+        self._connection_pool: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._pool_slots = threading.BoundedSemaphore(self.max_pool_size)
         self.is_connected = False
+        # (cached_at, result) keyed by table pattern / table name
+        self._schema_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._table_schema_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # LRU of execute_sql results: digest of (limit, sql) -> (cached_at, result)
+        self._query_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        # Dashboard KPIs: name -> (sql, refresh_seconds); the latest result of
+        # each is kept in _metric_values and refreshed by _metric_refresher
+        self.metrics: Dict[str, Tuple[str, float]] = _load_metrics()
+        self._metric_values: Dict[str, Dict[str, Any]] = {}
 
     def connect(self):
-        """Set up connection to P21 database."""
+        """Build the connection string and check that ODBC is usable."""
         try:
             if not self.dsn:
                 raise ValueError("P21_DSN environment variable must be set")
 
             self.connection_string = f"DSN={self.dsn};"
-            logger.info(f"Connecting to P21 database via DSN: {self.dsn}")
+            logger.info(f"Using P21 database via DSN: {self.dsn}")
 
-            # Test connection
-            test_conn = pyodbc.connect(self.connection_string, timeout=10)
-            test_conn.close()
+            # Only confirm an ODBC driver is installed; the first query opens
+            # the first real connection, so startup skips a full handshake
+            # and a bad DSN surfaces as that query's error
+            if not pyodbc.drivers():
+                raise RuntimeError("No ODBC drivers are installed")
 
             self.is_connected = True
-            logger.info("Successfully connected to P21 database")
 
         except Exception as e:
             logger.error(f"Failed to connect to P21 database: {e}")
             self.is_connected = False
             raise
 
+    def _connect(self):
+        """Open a new connection; every query here is a read, so skip the implicit transaction."""
+        return pyodbc.connect(self.connection_string, autocommit=True, timeout=5)
+
+    def warm_up(self):
+        """Open one connection and park it in the pool.
+
+        Run in the background at startup so the ODBC driver load, DSN lookup
+        and login happen before the first tool call rather than during it.
+        """
+        try:
+            self._connection_pool.put_nowait(self._connect())
+            logger.info("Warm database connection ready")
+        except Exception as e:
+            logger.warning(f"Could not pre-open a database connection: {e}")
+
     def get_connection(self):
-        """Get database connection from pool or create new one."""
+        """Check out a connection, waiting while max_pool_size are in use.
+
+        Every connection obtained here must be handed back with
+        close_connection.
+        """
         if not self.is_connected or not self.connection_string:
             self.connect()
 
+        self._pool_slots.acquire()
         try:
             # Try to reuse connection from pool
-            if self._connection_pool:
-                conn = self._connection_pool.pop()
-                return conn
+            try:
+                return self._connection_pool.get_nowait()
+            except queue.Empty:
+                pass
 
-            # Create new connection
-            conn = pyodbc.connect(self.connection_string, timeout=5)
+            conn = self._connect()
             logger.info("Created new database connection")
             return conn
 
         except Exception as e:
+            self._pool_slots.release()
             logger.error(f"Failed to get database connection: {e}")
             raise
 
     def close_connection(self, conn):
-        """Return connection to pool or close if pool is full."""
+        """Return a checked-out connection to the pool."""
         try:
-            if len(self._connection_pool) < self.max_pool_size:
-                self._connection_pool.append(conn)
-            else:
-                conn.close()
+            self._connection_pool.put_nowait(conn)
+        finally:
+            self._pool_slots.release()
+
+    def discard_connection(self, conn):
+        """Close a checked-out connection that is no longer usable."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        finally:
+            self._pool_slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection for the duration of a with block.
+
+        A connection that failed with a disconnect error is closed instead
+        of going back to the pool.
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
         except Exception as e:
-            logger.error(f"Error closing connection: {e}")
-            try:
-                conn.close()
-            except:
-                pass
+            if _is_disconnect(e):
+                self.discard_connection(conn)
+            else:
+                self.close_connection(conn)
+            raise
+        else:
+            self.close_connection(conn)
+
+    def _cached_query(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached execute_sql result, or None."""
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= QUERY_CACHE_TTL:
+                del self._query_cache[key]
+                return None
+            self._query_cache.move_to_end(key)
+            return entry[1]
+
+    def _cache_query(self, key: bytes, result: Dict[str, Any]) -> None:
+        """Store an execute_sql result, evicting the least recently used entry."""
+        if QUERY_CACHE_TTL <= 0:
+            return
+        with self._query_cache_lock:
+            self._query_cache[key] = (time.monotonic(), result)
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+    def execute_sql(self, sql_query: str, limit: int = 1000, use_cache: bool = True,
+                    result_format: str = "aos") -> Dict[str, Any]:
+        """Execute arbitrary SQL query.
+
+        result_format "aos" returns "data" as one dict per row; "soa" returns
+        "rows" as value lists in "columns" order, without repeating the column
+        names in every row. Successful results are cached for QUERY_CACHE_TTL
+        seconds; pass use_cache=False to always hit the database.
+        """
+        cache_key = hashlib.blake2b(f"{result_format}\0{limit}\0{sql_query}".encode('utf-8'),
+                                    digest_size=16).digest()
+        if use_cache:
+            cached = self._cached_query(cache_key)
+            if cached is not None:
+                logger.info("Returning cached result for SQL")
+                return cached
 
-    def execute_sql(self, sql_query: str, limit: int = 1000) -> Dict[str, Any]:
-        """Execute arbitrary SQL query."""
         start_time = time.time()
         conn = None
 
         try:
             logger.info(f"Executing SQL: {sql_query}")
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            # Add basic security check for dangerous operations
-            sql_upper = sql_query.upper().strip()
-            dangerous_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'INSERT', 'UPDATE', 'ALTER', 'CREATE']
 
-            # Allow only SELECT statements for safety
-            if not sql_upper.startswith('SELECT'):
+            # Allow only SELECT statements (optionally behind a CTE) for safety
+            if not _SELECT_RE.match(sql_query):
                 return {
                     "success": False,
                     "error": "Only SELECT statements are allowed for security reasons",
                     "query": sql_query
                 }
 
-            # Check for dangerous keywords in SELECT statements
-            for keyword in dangerous_keywords:
-                if keyword in sql_upper:
-                    return {
-                        "success": False,
-                        "error": f"SQL contains potentially dangerous keyword: {keyword}",
-                        "query": sql_query
-                    }
+            # Check for dangerous keywords in SELECT statements. Whole words
+            # only, so columns like date_created or updated_at pass.
+            unsafe = _UNSAFE_RE.search(sql_query)
+            if unsafe:
+                return {
+                    "success": False,
+                    "error": f"SQL contains potentially dangerous keyword: {unsafe.group().upper()}",
+                    "query": sql_query
+                }
+
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.arraysize = min(limit, FETCH_ARRAYSIZE) if limit else FETCH_ARRAYSIZE
+
+            # Have SQL Server stop at limit rows instead of producing the full
+            # result for the fetch loop to cut short; the fetch loop still
+            # enforces limit when the query can't take a TOP
+            exec_sql, params = sql_query, []
+            if limit:
+                limited_sql = _inject_top(sql_query)
+                if limited_sql:
+                    exec_sql, params = limited_sql, [int(limit)]
 
             logger.info("Query validated, executing...")
-            cursor.execute(sql_query)
+            # No liveness probe before the query: a dead pooled connection
+            # shows up as a disconnect error here, and is replaced once.
+            try:
+                cursor.execute(exec_sql, params)
+            except pyodbc.Error as e:
+                if not _is_disconnect(e):
+                    raise
+                logger.warning(f"Connection lost ({e.args[0]}), reconnecting and retrying once")
+                self.discard_connection(conn)
+                conn = None
+                conn = self.get_connection()
+                cursor = conn.cursor()
+                cursor.arraysize = min(limit, FETCH_ARRAYSIZE) if limit else FETCH_ARRAYSIZE
+                cursor.execute(exec_sql, params)
 
             # Get column names
             columns = [column[0] for column in cursor.description] if cursor.description else []
 
-            # Fetch results with limit
-            if limit:
-                rows = cursor.fetchmany(limit)
-            else:
-                rows = cursor.fetchall()
-
-            logger.info(f"Fetched {len(rows)} rows")
-
-            # Convert rows to list of dictionaries
+            # Fetch in arraysize batches, converting each batch as it arrives
+            # and stopping as soon as limit rows are collected, so the raw rows
+            # are never all held alongside the converted dicts. Values stay as
+            # driver types; orjson converts them when the result is serialized.
+            columnar = result_format == "soa"
             data = []
-            for row in rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    column_name = columns[i] if i < len(columns) else f"column_{i}"
-                    # Handle different data types
-                    if hasattr(value, '__float__'):
-                        row_dict[column_name] = float(value)
-                    elif hasattr(value, '__int__'):
-                        row_dict[column_name] = int(value)
-                    elif value is None:
-                        row_dict[column_name] = None
+            remaining = limit or None  # None: fetch everything
+            if columns:
+                while remaining is None or remaining > 0:
+                    batch_size = cursor.arraysize if remaining is None else min(cursor.arraysize, remaining)
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    if columnar:
+                        data.extend(list(row) for row in batch)
                     else:
-                        row_dict[column_name] = str(value)
-                data.append(row_dict)
+                        data.extend(dict(zip(columns, row)) for row in batch)
+                    if remaining is not None:
+                        remaining -= len(batch)
+
+            logger.info(f"Fetched {len(data)} rows")
 
             elapsed = time.time() - start_time
             logger.info(f"SQL execution completed in {elapsed:.2f} seconds")
 
-            return {
+            result = {
                 "success": True,
                 "row_count": len(data),
                 "columns": columns,
-                "data": data,
+                "rows" if columnar else "data": data,
                 "query": sql_query,
-                "limited": limit is not None and len(rows) == limit,
+                "limited": bool(limit) and len(data) == limit,
                 "execution_time": elapsed
             }
+            self._cache_query(cache_key, result)
+            return result
 
         except Exception as e:
             elapsed = time.time() - start_time
             logger.error(f"Error executing SQL after {elapsed:.2f}s: {e}")
+            if conn and _is_disconnect(e):
+                self.discard_connection(conn)
+                conn = None
             return {
                 "success": False,
                 "error": str(e),
@@ -189,56 +460,203 @@ class P21Database:
             if conn:
                 self.close_connection(conn)
 
-    def get_tables(self) -> List[str]:
-        """Get list of available tables."""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+    def refresh_metric(self, name: str) -> Dict[str, Any]:
+        """Run a registered metric's query and store the result."""
+        sql, _ = self.metrics[name]
+        result = self.execute_sql(sql, limit=0, use_cache=False)
+        if not result.get("success"):
+            return result
 
-            cursor.execute("""
-                SELECT TABLE_NAME
-                FROM INFORMATION_SCHEMA.TABLES
-                WHERE TABLE_TYPE = 'BASE TABLE'
-                ORDER BY TABLE_NAME
-            """)
+        rows = result["data"]
+        if len(rows) == 1 and len(result["columns"]) == 1:
+            value = rows[0][result["columns"][0]]
+        else:
+            value = rows
+        entry = {
+            "success": True,
+            "metric": name,
+            "value": value,
+            "refreshed_at": datetime.now(timezone.utc).isoformat()
+        }
+        self._metric_values[name] = entry
+        return entry
+
+    def get_metric(self, name: str) -> Dict[str, Any]:
+        """Return a metric's last value, computing it now if it has none yet."""
+        if name not in self.metrics:
+            return {
+                "success": False,
+                "error": f"Unknown metric: {name}",
+                "metrics": sorted(self.metrics)
+            }
+        return self._metric_values.get(name) or self.refresh_metric(name)
 
-            tables = [row[0] for row in cursor.fetchall()]
-            self.close_connection(conn)
-            return tables
+    def get_tables(self, table_pattern: Optional[str] = None) -> List[str]:
+        """Get list of available tables, optionally filtered by a LIKE pattern."""
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = FETCH_ARRAYSIZE
+
+                sql = """
+                    SELECT TABLE_NAME
+                    FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_TYPE = 'BASE TABLE'
+                """
+                params = []
+                if table_pattern:
+                    sql += " AND TABLE_NAME LIKE ?"
+                    params.append(table_pattern)
+                cursor.execute(sql + " ORDER BY TABLE_NAME", params)
+
+                return [row[0] for row in cursor.fetchall()]
 
         except Exception as e:
             logger.error(f"Error getting tables: {e}")
             return []
 
-    def get_table_schema(self, table_name: str) -> Dict[str, Any]:
+    def get_table_schema(self, table_name: str, refresh: bool = False) -> Dict[str, Any]:
         """Get schema information for a specific table."""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME = %s
-                ORDER BY ORDINAL_POSITION
-            """, (table_name,))
-
-            columns = []
-            for row in cursor.fetchall():
-                columns.append({
-                    "name": row[0],
-                    "type": row[1],
-                    "nullable": row[2] == "YES",
-                    "default": row[3]
-                })
+        cached = self._table_schema_cache.get(table_name)
+        if cached and not refresh and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            return cached[1]
 
-            self.close_connection(conn)
-            return {"table": table_name, "columns": columns}
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = FETCH_ARRAYSIZE
+
+                cursor.execute("""
+                    SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+                    FROM INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_NAME = ?
+                    ORDER BY ORDINAL_POSITION
+                """, (table_name,))
+
+                columns = []
+                for row in cursor.fetchall():
+                    columns.append({
+                        "name": row[0],
+                        "type": row[1],
+                        "nullable": row[2] == "YES",
+                        "default": row[3]
+                    })
+
+            result = {"table": table_name, "columns": columns}
+            self._table_schema_cache[table_name] = (time.monotonic(), result)
+            return result
 
         except Exception as e:
             logger.error(f"Error getting schema for {table_name}: {e}")
             return {"error": str(e)}
 
+    def get_data_dictionary(self, table_pattern: Optional[str] = None,
+                            refresh: bool = False,
+                            table_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get schema information for all tables, cached for SCHEMA_CACHE_TTL seconds.
+
+        table_names restricts the result to those tables (combined with
+        table_pattern when both are given). refresh=True bypasses and
+        replaces the cached entries. A single table name may be passed as a
+        bare string.
+        """
+        if isinstance(table_names, str):
+            table_names = [table_names]
+        if table_names is not None:
+            if (not isinstance(table_names, list)
+                    or not all(isinstance(name, str) for name in table_names)):
+                return {"success": False, "error": "table_names must be a list of strings"}
+            if len(table_names) > MAX_TABLE_NAMES:
+                return {"success": False,
+                        "error": f"table_names accepts at most {MAX_TABLE_NAMES} tables"}
+            table_names = sorted(set(table_names))
+        key = table_pattern or '*'
+        if table_names:
+            key += '\0' + '\0'.join(table_names)
+        cached = self._schema_cache.get(key)
+        if cached and not refresh and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            logger.info(f"Data dictionary for {key} served from cache")
+            return cached[1]
+
+        # Two queries regardless of table count: the table list, then every
+        # matching column in table order, appended as the batches arrive
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = FETCH_ARRAYSIZE
+
+                tables_sql = """
+                    SELECT TABLE_NAME
+                    FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_TYPE = 'BASE TABLE'
+                """
+                columns_sql = """
+                    SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+                    FROM INFORMATION_SCHEMA.COLUMNS
+                    WHERE 1 = 1
+                """
+                filters = ""
+                params = []
+                if table_pattern:
+                    filters += " AND TABLE_NAME LIKE ?"
+                    params.append(table_pattern)
+                if table_names:
+                    filters += f" AND TABLE_NAME IN ({', '.join('?' * len(table_names))})"
+                    params.extend(table_names)
+                tables_sql += filters
+                columns_sql += filters
+
+                # TABLE_SCHEMA leads both sorts so the order is total even
+                # when two schemas share a table name; OFFSET paging over a
+                # non-unique order could skip or repeat rows between pages
+                cursor.execute(tables_sql + " ORDER BY TABLE_SCHEMA, TABLE_NAME", params)
+                tables = [row[0] for row in cursor.fetchall()]
+                schema_info = {table: {"table": table, "columns": []} for table in tables}
+
+                # Columns are read in pages so no single statement has to
+                # produce the whole schema; rows arrive ordered by table, so
+                # group each page and look each table up once rather than
+                # once per column. A table can straddle two pages, hence extend.
+                columns_sql += (" ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION"
+                                " OFFSET ? ROWS FETCH NEXT ? ROWS ONLY")
+                offset = 0
+                while True:
+                    cursor.execute(columns_sql, [*params, offset, SCHEMA_PAGE_SIZE])
+                    page = cursor.fetchall()
+                    for table_name, group in groupby(page, key=_first_column):
+                        table_info = schema_info.get(table_name)
+                        if table_info is None:
+                            continue  # a view's columns
+                        table_info["columns"].extend(
+                            {
+                                "name": column_name,
+                                "type": data_type,
+                                "nullable": is_nullable == "YES",
+                                "default": default
+                            }
+                            for _, column_name, data_type, is_nullable, default in group
+                        )
+                    if len(page) < SCHEMA_PAGE_SIZE:
+                        break
+                    offset += SCHEMA_PAGE_SIZE
+
+        except Exception as e:
+            logger.error(f"Error fetching data dictionary: {e}")
+            return {"success": False, "error": str(e)}
+
+        now = time.monotonic()
+        for table, table_info in schema_info.items():
+            self._table_schema_cache[table] = (now, table_info)
+
+        result = {
+            "success": True,
+            "tables_examined": len(tables),
+            "tables": tables,
+            "schema": schema_info
+        }
+        self._schema_cache[key] = (now, result)
+        return result
+
 # Global database instance
 db = P21Database()
 
@@ -261,6 +679,17 @@ async def list_tools():
                         "default": 1000,
                         "minimum": 1,
                         "maximum": 10000
+                    },
+                    "use_cache": {
+                        "type": "boolean",
+                        "description": "Reuse a result of the same query from the last few seconds (default: true)",
+                        "default": True
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": ["aos", "soa"],
+                        "description": "'aos': data as one object per row (default); 'soa': columns once plus rows as value arrays",
+                        "default": "aos"
                     }
                 },
                 "required": ["sql_query"]
@@ -271,10 +700,39 @@ async def list_tools():
             description="Get schema information for all tables in the P21 database",
             inputSchema={
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "table_pattern": {
+                        "type": "string",
+                        "description": "Optional SQL LIKE pattern to filter tables (e.g. 'oe_%')"
+                    },
+                    "table_names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional exact table names to limit the dictionary to"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Bypass the cached schema and re-read it from the database",
+                        "default": False
+                    }
+                },
                 "required": []
             }
         ),
+        Tool(
+            name="get_metric",
+            description="Get the latest value of a pre-computed dashboard metric",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string",
+                        "description": "Metric name as registered in P21_METRICS_FILE"
+                    }
+                },
+                "required": ["name"]
+            }
+        ),
         Tool(
             name="list_tables",
             description="List all available tables in the P21 database",
@@ -287,69 +745,69 @@ async def list_tools():
     ]
 
 async def call_tool(tool_name: str, arguments: Any) -> List[TextContent]:
-    """Handle tool calls."""
+    """Handle tool calls.
+
+    Database work runs in worker threads (asyncio.to_thread) so concurrent
+    tool calls overlap on pooled connections instead of blocking the loop.
+    """
     logger.info(f"Tool called: {tool_name} with args: {arguments}")
 
     try:
         if tool_name == "execute_sql":
             sql_query = arguments.get("sql_query", "")
             limit = arguments.get("limit", 1000)
+            use_cache = arguments.get("use_cache", True)
+            result_format = arguments.get("format", "aos")
 
-            result = db.execute_sql(sql_query, limit)
+            result = await asyncio.to_thread(db.execute_sql, sql_query, limit,
+                                             use_cache=use_cache, result_format=result_format)
 
             # Format result as JSON for MCP response
-            return [TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
+            return _tool_content(result)
 
         elif tool_name == "list_tables":
-            tables = db.get_tables()
+            tables = await asyncio.to_thread(db.get_tables)
             result = {
                 "success": True,
                 "tables": tables,
                 "count": len(tables)
             }
-            return [TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
-
-        elif tool_name == "get_data_dictionary":
-            tables = db.get_tables()
-            schema_info = {}
+            return _tool_content(result)
 
-            for table in tables:
-                schema_info[table] = db.get_table_schema(table)
+        elif tool_name == "get_metric":
+            name = arguments.get("name", "")
+            if name in db._metric_values:
+                result = db.get_metric(name)
+            else:
+                result = await asyncio.to_thread(db.get_metric, name)
+            return _tool_content(result)
 
-            result = {
-                "success": True,
-                "tables_examined": len(tables),
-                "tables": list(tables),
-                "schema": schema_info
-            }
-            return [TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
+        elif tool_name == "get_data_dictionary":
+            result = await asyncio.to_thread(
+                db.get_data_dictionary,
+                table_pattern=arguments.get("table_pattern"),
+                refresh=bool(arguments.get("refresh", False)),
+                table_names=arguments.get("table_names")
+            )
+            return _tool_content(result)
 
         else:
             return [TextContent(
                 type="text",
-                text=json.dumps({
+                text=_dumps({
                     "success": False,
                     "error": f"Unknown tool: {tool_name}"
-                }, indent=2)
+                })
             )]
 
     except Exception as e:
         logger.error(f"Error in call_tool: {e}")
         return [TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "success": False,
                 "error": str(e)
-            }, indent=2)
+            })
         )]
 
 async def list_resources():
@@ -372,19 +830,33 @@ async def list_resources():
 async def read_resource(uri: str) -> str:
     """Read a resource."""
     if uri == "p21://tables":
-        tables = db.get_tables()
-        return json.dumps({"tables": tables}, indent=2)
+        tables = await asyncio.to_thread(db.get_tables)
+        return _dumps({"tables": tables})
 
     elif uri == "p21://schema":
-        tables = db.get_tables()
-        schema_info = {}
-        for table in tables:
-            schema_info[table] = db.get_table_schema(table)
-        return json.dumps(schema_info, indent=2)
+        result = await asyncio.to_thread(db.get_data_dictionary)
+        if not result.get("success"):
+            # Hand back the {"success": False, "error": ...} payload rather
+            # than failing the read on the missing "schema" key
+            logger.error(f"Schema resource unavailable: {result.get('error')}")
+            return _dumps(result)
+        return _dumps(result["schema"])
 
     else:
         raise ValueError(f"Unknown resource: {uri}")
 
+async def _metric_refresher():
+    """Re-run each registered metric every refresh_seconds, failed or not."""
+    next_run: Dict[str, float] = {}
+    while True:
+        for name, (_, interval) in db.metrics.items():
+            if next_run.get(name, 0) <= time.monotonic():
+                result = await asyncio.to_thread(db.refresh_metric, name)
+                if not result.get("success"):
+                    logger.error(f"Metric {name} refresh failed: {result.get('error')}")
+                next_run[name] = time.monotonic() + interval
+        await asyncio.sleep(max(min(next_run.values()) - time.monotonic(), 1))
+
 async def main():
     """Main server function."""
     logger.info("Starting P21 MCP Server...")
@@ -392,6 +864,11 @@ async def main():
     try:
         # Initialize database connection
         db.connect()
+        # Tasks are held for the life of main() so they aren't garbage collected
+        warm_up = asyncio.create_task(asyncio.to_thread(db.warm_up))
+        if db.metrics:
+            logger.info(f"Refreshing {len(db.metrics)} dashboard metrics in the background")
+            metric_refresher = asyncio.create_task(_metric_refresher())
 
         # Create MCP server
         server = Server("p21-server", version="1.0.0")
@@ -426,5 +903,4 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+POR shared helpers
+Rules common to the POR MCP and HTTP servers, which front the same MS Access
+database
+"""
+
+import re
+
+# Access object names: up to 64 characters, none of . ! ` [ ] or control
+# characters, and no leading space. Table and column names are interpolated
+# into SQL as [name], so anything that could close the bracket is refused;
+# values always travel as bound parameters.
+IDENTIFIER_RE = re.compile(r'[^ .!`\[\]\x00-\x1f][^.!`\[\]\x00-\x1f]{0,63}')
+
+def validate_identifier(name: str, kind: str) -> str:
+    """Return name if it is a valid Access object name, otherwise raise ValueError."""
+    if not isinstance(name, str) or not IDENTIFIER_RE.fullmatch(name):
+        raise ValueError(f"Invalid {kind} name: {name!r}")
+    return name
@@ -4,19 +4,30 @@ POR HTTP MCP Server
 HTTP wrapper for the POR MS Access database functionality
 """
 
-import json
+import decimal
 import logging
 import os
 import sys
-from typing import Any, Dict
+from itertools import chain
+from typing import Any, Dict, List
 
+import orjson
 import pyodbc
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+from por_common import validate_identifier
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Let the ODBC driver manager keep connections alive across reconnects
+pyodbc.pooling = True
+
+# Rows per fetchmany call; results are read in batches of this size so the
+# driver rows and the values built from them are never both held in full
+FETCH_BATCH_SIZE = 1000
+
 class PORServer:
     """POR MS Access Database operations."""
     
@@ -62,15 +73,26 @@ class PORServer:
             return self._connection
     
     def read_table_column(self, table_name: str, column_name: str, 
-                         where_clause: str = None, limit: int = 100) -> Dict[str, Any]:
-        """Read data from a specific table column."""
+                         where_clause: str = None, limit: int = 100,
+                         where_params: List[Any] = None) -> Dict[str, Any]:
+        """Read data from a specific table column.
+
+        where_clause may use ? markers bound from where_params.
+        """
         try:
+            # Identifiers can't be bound as parameters, so they are checked
+            # before being bracketed into the statement
+            validate_identifier(table_name, "table")
+            validate_identifier(column_name, "column")
+            
             conn = self.get_connection()
             cursor = conn.cursor()
+            cursor.arraysize = FETCH_BATCH_SIZE
             
-            # Build SQL query for MS Access (using TOP instead of LIMIT)
+            # Build SQL query for MS Access (using TOP instead of LIMIT).
+            # Access can't bind TOP, so limit is forced to an integer instead.
             if limit:
-                sql = f"SELECT TOP {limit} [{column_name}] FROM [{table_name}]"
+                sql = f"SELECT TOP {int(limit)} [{column_name}] FROM [{table_name}]"
             else:
                 sql = f"SELECT [{column_name}] FROM [{table_name}]"
             
@@ -78,11 +100,10 @@ class PORServer:
                 sql += f" WHERE {where_clause}"
             
             logger.info(f"Executing query: {sql}")
-            cursor.execute(sql)
+            cursor.execute(sql, list(where_params or ()))
             
             # Fetch results
-            rows = cursor.fetchall()
-            data = [row[0] if row[0] is not None else None for row in rows]
+            data = [row[0] for row in chain.from_iterable(iter(cursor.fetchmany, []))]
             cursor.close()
             
             return {
@@ -108,6 +129,7 @@ class PORServer:
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
+            cursor.arraysize = FETCH_BATCH_SIZE
             
             # For MS Access, modify LIMIT syntax to TOP
             if 'LIMIT' in sql_query.upper():
@@ -116,18 +138,11 @@ class PORServer:
             logger.info(f"Executing SQL query: {sql_query}")
             cursor.execute(sql_query)
             
-            # Fetch results
-            rows = cursor.fetchall()
             columns = [desc[0] for desc in cursor.description] if cursor.description else []
             
-            # Convert rows to list of dictionaries
-            data = []
-            for row in rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    column_name = columns[i] if i < len(columns) else f"column_{i}"
-                    row_dict[column_name] = value
-                data.append(row_dict)
+            # Convert rows to list of dictionaries; values are passed through
+            # as-is and orjson's default hook handles Decimal at encode time
+            data = [dict(zip(columns, row)) for row in chain.from_iterable(iter(cursor.fetchmany, []))]
             
             cursor.close()
             
@@ -147,6 +162,16 @@ class PORServer:
                 "query": sql_query
             }
 
+def _json_default(value):
+    """orjson fallback for the driver types it can't serialize natively.
+
+    Decimal (Access currency) columns become floats and anything else is
+    stringified.
+    """
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
 # Global server instance
 por_server = PORServer()
 
@@ -156,7 +181,7 @@ class RequestHandler(BaseHTTPRequestHandler):
             try:
                 content_length = int(self.headers['Content-Length'])
                 post_data = self.rfile.read(content_length)
-                request_data = json.loads(post_data.decode('utf-8'))
+                request_data = orjson.loads(post_data)
                 
                 tool_name = request_data.get('name')
                 arguments = request_data.get('arguments', {})
@@ -166,7 +191,8 @@ class RequestHandler(BaseHTTPRequestHandler):
                         table_name=arguments.get('table_name'),
                         column_name=arguments.get('column_name'),
                         where_clause=arguments.get('where_clause'),
-                        limit=arguments.get('limit', 100)
+                        limit=arguments.get('limit', 100),
+                        where_params=arguments.get('where_params')
                     )
                 elif tool_name == 'execute_sql':
                     result = por_server.execute_sql(
@@ -186,7 +212,7 @@ class RequestHandler(BaseHTTPRequestHandler):
                 self.send_header('Access-Control-Allow-Headers', 'Content-Type')
                 self.end_headers()
                 
-                response = json.dumps(result, indent=2).encode('utf-8')
+                response = orjson.dumps(result, default=_json_default)
                 self.wfile.write(response)
                 
             except Exception as e:
@@ -194,7 +220,7 @@ class RequestHandler(BaseHTTPRequestHandler):
                 self.send_response(500)
                 self.send_header('Content-type', 'application/json')
                 self.end_headers()
-                error_response = json.dumps({"success": False, "error": str(e)}).encode('utf-8')
+                error_response = orjson.dumps({"success": False, "error": str(e)})
                 self.wfile.write(error_response)
         else:
             self.send_response(404)
@@ -8,6 +8,7 @@ import asyncio
 import json
 import logging
 import os
+import re
 import sys
 from typing import Any, Dict, List, Optional, Union
 
@@ -29,12 +30,25 @@ from mcp.types import (
     EmbeddedResource
 )
 
+from por_common import validate_identifier
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# execute_sql checks, compiled once: the statement must start with SELECT, and
+# a statement that is exactly "SELECT 1" is the connection test query.
+# Matching case-insensitively avoids upper-casing a copy of every statement.
+_SELECT_RE = re.compile(r'\s*SELECT\b', re.IGNORECASE)
+_TEST_QUERY_RE = re.compile(r'\s*SELECT\s+1\s*;?\s*', re.IGNORECASE)
+
 class PORMCPServer:
-    """MCP Server for POR MS Access database operations."""
+    """MCP Server for POR MS Access database operations.
+
+    The public tool methods are coroutines; each runs its blocking pyodbc
+    work in a worker thread via asyncio.to_thread so the stdio event loop
+    keeps serving other tool calls meanwhile.
+    """
     
     def __init__(self):
         self.server = Server("por-mcp")
@@ -73,20 +87,35 @@ class PORMCPServer:
     
     async def read_table_column(self, table_name: str, column_name: str, 
                                where_clause: Optional[str] = None, 
-                               limit: Optional[int] = 100) -> Dict[str, Any]:
-        """Read data from a specific table column."""
+                               limit: Optional[int] = 100,
+                               where_params: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Read data from a specific table column.
+
+        where_clause may contain ? placeholders, filled from where_params.
+        """
+        return await asyncio.to_thread(self._read_table_column, table_name, column_name,
+                                       where_clause, limit, where_params)
+
+    def _read_table_column(self, table_name: str, column_name: str,
+                           where_clause: Optional[str], limit: Optional[int],
+                           where_params: Optional[List[Any]] = None) -> Dict[str, Any]:
         try:
+            validate_identifier(table_name, "table")
+            validate_identifier(column_name, "column")
+
             with self.get_db() as conn:
                 cursor = conn.cursor()
                 
-                # Build SQL query
-                sql = f"SELECT [{column_name}] FROM [{table_name}]"
+                # Build SQL query. Access has no LIMIT clause and doesn't
+                # accept a parameter for TOP, so the (integer) limit is inlined.
+                if limit:
+                    sql = f"SELECT TOP {int(limit)} [{column_name}] FROM [{table_name}]"
+                else:
+                    sql = f"SELECT [{column_name}] FROM [{table_name}]"
                 if where_clause:
                     sql += f" WHERE {where_clause}"
-                if limit:
-                    sql += f" LIMIT {limit}"
                 
-                cursor.execute(sql)
+                cursor.execute(sql, where_params or [])
                 rows = cursor.fetchall()
                 
                 # Extract data
@@ -111,15 +140,28 @@ class PORMCPServer:
             }
     
     async def write_table_column(self, table_name: str, column_name: str, 
-                                value: Any, where_clause: str) -> Dict[str, Any]:
-        """Write/update data in a specific table column."""
+                                value: Any, where_clause: str,
+                                where_params: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Write/update data in a specific table column.
+
+        where_clause may contain ? placeholders, filled from where_params.
+        """
+        return await asyncio.to_thread(self._write_table_column, table_name, column_name,
+                                       value, where_clause, where_params)
+
+    def _write_table_column(self, table_name: str, column_name: str,
+                            value: Any, where_clause: str,
+                            where_params: Optional[List[Any]] = None) -> Dict[str, Any]:
         try:
+            validate_identifier(table_name, "table")
+            validate_identifier(column_name, "column")
+
             with self.get_db() as conn:
                 cursor = conn.cursor()
                 
                 # Build SQL UPDATE query
                 sql = f"UPDATE [{table_name}] SET [{column_name}] = ? WHERE {where_clause}"
-                cursor.execute(sql, (value,))
+                cursor.execute(sql, [value, *(where_params or [])])
                 conn.commit()
                 
                 affected_rows = cursor.rowcount
@@ -144,6 +186,9 @@ class PORMCPServer:
     
     async def get_data_dictionary(self, table_pattern: Optional[str] = None) -> Dict[str, Any]:
         """Download data dictionary/schema information from MS Access."""
+        return await asyncio.to_thread(self._get_data_dictionary, table_pattern)
+
+    def _get_data_dictionary(self, table_pattern: Optional[str]) -> Dict[str, Any]:
         try:
             with self.get_db() as conn:
                 cursor = conn.cursor()
@@ -203,11 +248,12 @@ class PORMCPServer:
 
     async def execute_sql(self, sql_query: str, limit: Optional[int] = 1000) -> Dict[str, Any]:
         """Execute SQL operations on MS Access database using pyodbc."""
+        return await asyncio.to_thread(self._execute_sql, sql_query, limit)
+
+    def _execute_sql(self, sql_query: str, limit: Optional[int]) -> Dict[str, Any]:
         try:
-            sql_upper = sql_query.upper().strip()
-            
             # Only allow SELECT statements for safety
-            if not sql_upper.startswith('SELECT'):
+            if not _SELECT_RE.match(sql_query):
                 return {
                     "success": False,
                     "error": "Only SELECT statements are supported for POR database",
@@ -218,7 +264,7 @@ class PORMCPServer:
                 cursor = conn.cursor()
                 
                 # Handle test connection query
-                if 'SELECT 1' in sql_upper:
+                if _TEST_QUERY_RE.fullmatch(sql_query):
                     return {
                         "success": True,
                         "row_count": 1,
@@ -235,19 +281,15 @@ class PORMCPServer:
                 # Get column names
                 columns = [column[0] for column in cursor.description]
                 
-                # Convert rows to list of dictionaries
-                data = []
-                for row in rows:
-                    row_dict = {}
-                    for i, column in enumerate(columns):
-                        row_dict[column] = row[i]
-                    data.append(row_dict)
+                # Apply limit if specified and needed, before converting so
+                # dropped rows are never turned into dicts
+                limited = bool(limit) and len(rows) > limit
+                if limited:
+                    rows = rows[:limit]
                 
-                # Apply limit if specified and needed
-                limited = False
-                if limit and len(data) > limit:
-                    data = data[:limit]
-                    limited = True
+                # Convert rows to list of dictionaries; zip/dict build each
+                # row in C rather than a per-column Python loop
+                data = [dict(zip(columns, row)) for row in rows]
                 
                 return {
                     "success": True,
@@ -290,7 +332,11 @@ async def list_tools(request: ListToolsRequest) -> ListToolsResult:
                         },
                         "where_clause": {
                             "type": "string",
-                            "description": "Optional WHERE clause to filter results"
+                            "description": "Optional WHERE clause to filter results; use ? for values"
+                        },
+                        "where_params": {
+                            "type": "array",
+                            "description": "Values bound to the ? placeholders in where_clause"
                         },
                         "limit": {
                             "type": "integer",
@@ -319,7 +365,11 @@ async def list_tools(request: ListToolsRequest) -> ListToolsResult:
                         },
                         "where_clause": {
                             "type": "string",
-                            "description": "WHERE clause to specify which rows to update"
+                            "description": "WHERE clause to specify which rows to update; use ? for values"
+                        },
+                        "where_params": {
+                            "type": "array",
+                            "description": "Values bound to the ? placeholders in where_clause"
                         }
                     },
                     "required": ["table_name", "column_name", "value", "where_clause"]
@@ -368,14 +418,16 @@ async def call_tool(request: CallToolRequest) -> CallToolResult:
                 table_name=request.arguments["table_name"],
                 column_name=request.arguments["column_name"],
                 where_clause=request.arguments.get("where_clause"),
-                limit=request.arguments.get("limit", 100)
+                limit=request.arguments.get("limit", 100),
+                where_params=request.arguments.get("where_params")
             )
         elif request.name == "write_table_column":
             result = await mcp_server.write_table_column(
                 table_name=request.arguments["table_name"],
                 column_name=request.arguments["column_name"],
                 value=request.arguments["value"],
-                where_clause=request.arguments["where_clause"]
+                where_clause=request.arguments["where_clause"],
+                where_params=request.arguments.get("where_params")
             )
         elif request.name == "get_data_dictionary":
             result = await mcp_server.get_data_dictionary(
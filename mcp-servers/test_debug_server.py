@@ -0,0 +1,66 @@
+"""Tests for debug_server's SQL rewriting helpers (no database needed)."""
+
+import pytest
+
+from debug_server import _count_sql, _with_top
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT a FROM t", "SELECT TOP 1000 a FROM t"),
+    ("  select a from t", "  select TOP 1000 a from t"),
+    ("SELECT DISTINCT a FROM t", "SELECT DISTINCT TOP 1000 a FROM t"),
+    ("SELECT ALL a FROM t", "SELECT ALL TOP 1000 a FROM t"),
+    ("SELECT distinctive FROM t", "SELECT TOP 1000 distinctive FROM t"),
+    # set operators inside a subquery or a string don't combine the outer query
+    ("SELECT a FROM (SELECT a FROM x UNION SELECT a FROM y) s",
+     "SELECT TOP 1000 a FROM (SELECT a FROM x UNION SELECT a FROM y) s"),
+    ("SELECT a FROM t WHERE note = 'union'", "SELECT TOP 1000 a FROM t WHERE note = 'union'"),
+    ("SELECT [except] FROM t", "SELECT TOP 1000 [except] FROM t"),
+])
+def test_with_top_adds_limit(sql, expected):
+    assert _with_top(sql, 1000) == expected
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT TOP 5 a FROM t",
+    "SELECT TOP (5) a FROM t",
+    "SELECT TOP(5) a FROM t",
+    "SELECT DISTINCT TOP 5 a FROM t",
+    "SELECT DISTINCT\nTOP 5 a FROM t",
+    "SELECT ALL TOP (3) a FROM t",
+    "SELECT a FROM t ORDER BY a OFFSET 0 ROWS FETCH NEXT 5 ROWS ONLY",
+    # a TOP would only limit the first branch of a set operation
+    "SELECT a FROM x UNION ALL SELECT a FROM y",
+    "SELECT a FROM x union SELECT a FROM y",
+    "SELECT a FROM x INTERSECT SELECT a FROM y",
+    "SELECT a FROM x\nEXCEPT\nSELECT a FROM y",
+])
+def test_with_top_keeps_existing_limit(sql):
+    assert _with_top(sql, 1000) == sql
+
+
+def test_with_top_coerces_limit():
+    assert _with_top("SELECT a FROM t", "5") == "SELECT TOP 5 a FROM t"
+
+
+@pytest.mark.parametrize("limit", [None, 0, -1, "-1", "five"])
+def test_with_top_without_limit(limit):
+    assert _with_top("SELECT a FROM t", limit) == "SELECT a FROM t"
+
+
+@pytest.mark.parametrize("sql, inner", [
+    ("SELECT a FROM t", "SELECT a FROM t"),
+    ("SELECT a FROM t;", "SELECT a FROM t"),
+    ("SELECT a FROM t ; \n", "SELECT a FROM t"),
+    ("SELECT a FROM t ORDER BY a DESC;", "SELECT a FROM t"),
+    ("SELECT a, b FROM t WHERE c = 'x' ORDER BY a, b", "SELECT a, b FROM t WHERE c = 'x'"),
+    # ORDER BY inside a subquery or a string literal is not the query's own
+    ("SELECT a FROM (SELECT TOP 5 a FROM t ORDER BY a) s",
+     "SELECT a FROM (SELECT TOP 5 a FROM t ORDER BY a) s"),
+    ("SELECT a FROM t WHERE note = 'order by (x'", "SELECT a FROM t WHERE note = 'order by (x'"),
+    # OFFSET/FETCH needs its ORDER BY
+    ("SELECT a FROM t ORDER BY a OFFSET 10 ROWS FETCH NEXT 5 ROWS ONLY;",
+     "SELECT a FROM t ORDER BY a OFFSET 10 ROWS FETCH NEXT 5 ROWS ONLY"),
+])
+def test_count_sql(sql, inner):
+    assert _count_sql(sql) == f"SELECT COUNT(*) FROM ({inner}) AS _sub"
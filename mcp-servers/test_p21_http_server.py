@@ -0,0 +1,138 @@
+"""Tests for p21_http_server helpers and the ASGI front end (no database needed)."""
+
+import asyncio
+import datetime
+import decimal
+import time
+
+import orjson
+import pytest
+
+import p21_http_server
+from p21_http_server import _accepted_encoding, _converter_for, _identity, _rejected_sql
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT a FROM t",
+    "  select a from t",
+    "SELECT date_created, UpdatedAt FROM t",
+    "SELECT a FROM t WHERE note = 'x'",
+])
+def test_rejected_sql_allows_selects(sql):
+    assert _rejected_sql(sql) is None
+
+
+@pytest.mark.parametrize("sql, error", [
+    ("DELETE FROM t", "Only SELECT statements"),
+    ("SELECTED a FROM t", "Only SELECT statements"),
+    ("SELECT a FROM t; DROP TABLE t", "dangerous keyword: DROP"),
+    ("select a from t; update t set a = 1", "dangerous keyword: UPDATE"),
+    ("SELECT a FROM MCP_Sandboxed_Inv", "MCP Sandbox"),
+])
+def test_rejected_sql_refuses(sql, error):
+    assert error in _rejected_sql(sql)
+
+
+def test_converter_for_leaves_strings_alone():
+    assert _converter_for(str) is _identity
+
+
+@pytest.mark.parametrize("type_code, value, expected", [
+    (int, 7, 7),
+    (bool, True, 1),
+    (float, 1.5, 1.5),
+    (decimal.Decimal, decimal.Decimal("12.50"), 12.5),
+    (datetime.date, datetime.date(2024, 3, 1), "2024-03-01"),
+    (datetime.datetime, datetime.datetime(2024, 3, 1, 8, 30), "2024-03-01T08:30:00"),
+    (datetime.time, datetime.time(8, 30), "08:30:00"),
+    (bytearray, bytearray(b"ab"), "bytearray(b'ab')"),
+    (None, "x", "x"),
+])
+def test_converter_for_maps_types(type_code, value, expected):
+    converted = _converter_for(type_code)(value)
+    assert converted == expected
+    assert type(converted) is type(expected)
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    monkeypatch.setitem(p21_http_server._COMPRESSORS, b'br', lambda body: body)
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", b'gzip'),
+    ("GZIP;q=0.5", b'gzip'),
+    ("gzip, deflate, br", b'br'),
+    ("br;q=1.0", b'br'),
+    ("gzip;q=0", None),
+    ("gzip;q=0, identity", None),
+    ("br;q=0, gzip", b'gzip'),
+    ("br; q=0.000, gzip;q=0.8", b'gzip'),
+])
+def test_accepted_encoding(with_brotli, header, expected):
+    assert _accepted_encoding(header) == expected
+
+
+def test_accepted_encoding_never_streams_brotli(with_brotli):
+    assert _accepted_encoding("br, gzip", streaming=True) == b'gzip'
+    assert _accepted_encoding("br", streaming=True) is None
+
+
+def test_accepted_encoding_without_brotli(monkeypatch):
+    monkeypatch.delitem(p21_http_server._COMPRESSORS, b'br', raising=False)
+    assert _accepted_encoding("br, gzip") == b'gzip'
+    assert _accepted_encoding("br") is None
+
+
+def _call_asgi(body):
+    messages = [{"type": "http.request", "body": orjson.dumps(body)}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/call_tool", "query_string": b"", "headers": []}
+    asyncio.run(p21_http_server.app(scope, receive, send))
+    return sent
+
+
+def test_asgi_streams_ndjson(monkeypatch):
+    def stream_sql(sql_query, limit=None, columnar=False):
+        yield ["order_no"]
+        yield [{"order_no": 1}, {"order_no": 2}]
+        yield [{"order_no": 3}]
+
+    monkeypatch.setattr(p21_http_server.p21_server, "stream_sql", stream_sql)
+    sent = _call_asgi({"name": "execute_sql", "arguments": {"sql_query": "SELECT order_no FROM t", "stream": True}})
+
+    assert sent[0]["status"] == 200
+    assert dict(sent[0]["headers"])[b"content-type"] == b"application/x-ndjson"
+    assert all(message.get("more_body") for message in sent[1:-1])
+    assert not sent[-1].get("more_body")
+    lines = [orjson.loads(line) for line in b"".join(message["body"] for message in sent[1:]).splitlines()]
+    assert lines[0] == {"columns": ["order_no"]}
+    assert lines[1:4] == [{"order_no": 1}, {"order_no": 2}, {"order_no": 3}]
+    assert lines[4]["success"] and lines[4]["row_count"] == 3
+
+
+def test_schema_invalidation_reaches_other_workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(p21_http_server, "SCHEMA_STAMP_FILE", str(tmp_path / "schema.stamp"))
+    worker_a = p21_http_server.P21Server()
+    worker_b = p21_http_server.P21Server()
+    cached = {"success": True, "table_count": 0, "tables": {}}
+    worker_b._schema_cache[(None, False)] = (time.monotonic(), cached)
+    assert worker_b.get_data_dictionary() is cached
+
+    def no_database():
+        raise RuntimeError("no database in tests")
+
+    monkeypatch.setattr(worker_b, "acquire", no_database)
+    worker_a.invalidate_schema_cache()
+    assert worker_b.get_data_dictionary()["success"] is False
+    assert worker_b._schema_cache == {}
@@ -0,0 +1,153 @@
+"""Tests for p21_mcp_server helpers that don't need a database."""
+
+import asyncio
+import base64
+import gzip
+from contextlib import contextmanager
+
+import orjson
+import pytest
+
+import p21_mcp_server
+from p21_mcp_server import _inject_top, _tool_content, read_resource
+
+_LARGE_RESULT = {"success": True, "data": [{"order_no": n, "status": "open"} for n in range(5000)]}
+
+
+def test_schema_resource_returns_failure_payload(monkeypatch):
+    failure = {"success": False, "error": "DSN not found"}
+    monkeypatch.setattr(p21_mcp_server.db, "get_data_dictionary", lambda: failure)
+    assert orjson.loads(asyncio.run(read_resource("p21://schema"))) == failure
+
+
+def test_schema_resource_returns_schema(monkeypatch):
+    result = {"success": True, "tables": ["oe_hdr"], "schema": {"oe_hdr": {"columns": []}}}
+    monkeypatch.setattr(p21_mcp_server.db, "get_data_dictionary", lambda: result)
+    assert orjson.loads(asyncio.run(read_resource("p21://schema"))) == result["schema"]
+
+
+def test_tool_content_is_text_by_default():
+    [content] = _tool_content(_LARGE_RESULT)
+    assert content.type == "text"
+    assert orjson.loads(content.text) == _LARGE_RESULT
+
+
+def test_tool_content_compresses_large_results_when_enabled(monkeypatch):
+    monkeypatch.setattr(p21_mcp_server, "COMPRESS_RESULTS", True)
+    [small] = _tool_content({"success": True, "data": [1]})
+    assert small.type == "text"
+    [large] = _tool_content(_LARGE_RESULT)
+    assert large.type == "resource"
+    assert large.resource.mimeType == "application/json+gzip"
+    assert orjson.loads(gzip.decompress(base64.b64decode(large.resource.blob))) == _LARGE_RESULT
+
+
+class _CatalogCursor:
+    """Serves INFORMATION_SCHEMA rows in the order and pages the SQL asks for."""
+
+    # (TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION, COLUMN_NAME); item exists
+    # in two schemas
+    COLUMNS = [
+        ("dbo", "item", 1, "item_id"),
+        ("archive", "item", 1, "item_id"),
+        ("dbo", "item", 2, "qty"),
+        ("archive", "item", 2, "qty_old"),
+        ("dbo", "oe_hdr", 1, "order_no"),
+    ]
+
+    def __init__(self, executed):
+        self.executed = executed
+        self.rows = []
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+        if "INFORMATION_SCHEMA.TABLES" in sql:
+            self.rows = sorted({(schema, table) for schema, table, _, _ in self.COLUMNS})
+            self.rows = [(table,) for _, table in self.rows]
+            return
+        assert "ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION" in sql
+        offset, size = params[-2:]
+        ordered = sorted(self.COLUMNS)
+        self.rows = [(table, column, "int", "YES", None)
+                     for _, table, _, column in ordered[offset:offset + size]]
+
+    def fetchall(self):
+        return self.rows
+
+
+def _catalog_database(monkeypatch, executed):
+    class _Conn:
+        def cursor(self):
+            return _CatalogCursor(executed)
+
+    @contextmanager
+    def connection():
+        yield _Conn()
+
+    database = p21_mcp_server.P21Database()
+    monkeypatch.setattr(database, "connection", connection)
+    return database
+
+
+def test_data_dictionary_pages_in_a_total_order(monkeypatch):
+    executed = []
+    database = _catalog_database(monkeypatch, executed)
+    monkeypatch.setattr(p21_mcp_server, "SCHEMA_PAGE_SIZE", 2)
+
+    result = database.get_data_dictionary()
+    assert result["success"]
+    assert "ORDER BY TABLE_SCHEMA, TABLE_NAME" in executed[0][0]
+    columns = sorted(column["name"] for column in result["schema"]["item"]["columns"])
+    assert columns == ["item_id", "item_id", "qty", "qty_old"]
+    assert [column["name"] for column in result["schema"]["oe_hdr"]["columns"]] == ["order_no"]
+
+
+def test_data_dictionary_accepts_a_bare_table_name(monkeypatch):
+    executed = []
+    database = _catalog_database(monkeypatch, executed)
+
+    assert database.get_data_dictionary(table_names="oe_hdr")["success"]
+    tables_sql, params = executed[0]
+    assert "TABLE_NAME IN (?)" in tables_sql
+    assert params == ["oe_hdr"]
+
+
+@pytest.mark.parametrize("table_names", [
+    ["oe_hdr", 5],
+    ("oe_hdr",),
+    {"name": "oe_hdr"},
+    ["t%d" % n for n in range(p21_mcp_server.MAX_TABLE_NAMES + 1)],
+])
+def test_data_dictionary_rejects_bad_table_names(monkeypatch, table_names):
+    executed = []
+    database = _catalog_database(monkeypatch, executed)
+
+    result = database.get_data_dictionary(table_names=table_names)
+    assert not result["success"]
+    assert "table_names" in result["error"]
+    assert executed == []
+    assert not database._schema_cache
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT a FROM t", "SELECT TOP (?) a FROM t"),
+    ("select distinct a from t", "select distinct TOP (?) a from t"),
+    ("SELECT ALL a FROM t", "SELECT ALL TOP (?) a FROM t"),
+    ("WITH c AS (SELECT a FROM t) SELECT a FROM c",
+     "WITH c AS (SELECT a FROM t) SELECT TOP (?) a FROM c"),
+    ("SELECT a, (SELECT MAX(b) FROM u) FROM t", "SELECT TOP (?) a, (SELECT MAX(b) FROM u) FROM t"),
+    ("SELECT 'select top' AS note FROM t", "SELECT TOP (?) 'select top' AS note FROM t"),
+])
+def test_inject_top(sql, expected):
+    assert _inject_top(sql) == expected
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT TOP 5 a FROM t",
+    "SELECT DISTINCT TOP (5) a FROM t",
+    "SELECT a FROM t ORDER BY a OFFSET 10 ROWS FETCH NEXT 5 ROWS ONLY",
+    "SELECT a FROM t UNION SELECT a FROM u",
+    "EXEC some_proc",
+])
+def test_inject_top_leaves_query_alone(sql):
+    assert _inject_top(sql) is None
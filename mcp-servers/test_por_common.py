@@ -0,0 +1,40 @@
+"""Tests for the identifier rule shared by the POR servers."""
+
+import pytest
+
+import por_http_server
+import por_mcp
+from por_common import validate_identifier
+
+
+@pytest.mark.parametrize("name", [
+    "oe_hdr",
+    "Order Details",
+    "Rental-Items#2",
+    "x" * 64,
+])
+def test_validate_identifier_accepts_access_names(name):
+    assert validate_identifier(name, "table") == name
+
+
+@pytest.mark.parametrize("name", [
+    "",
+    " leading",
+    "x" * 65,
+    "oe_hdr] ; DROP TABLE x --",
+    "[oe_hdr",
+    "dbo.oe_hdr",
+    "Forms!Main",
+    "tick`name",
+    "tab\tname",
+    None,
+    42,
+])
+def test_validate_identifier_rejects(name):
+    with pytest.raises(ValueError):
+        validate_identifier(name, "column")
+
+
+def test_por_servers_share_the_rule():
+    assert por_http_server.validate_identifier is validate_identifier
+    assert por_mcp.validate_identifier is validate_identifier
@@ -0,0 +1,32 @@
+"""Tests for por_mcp's execute_sql statement checks."""
+
+import pytest
+
+from por_mcp import _SELECT_RE, _TEST_QUERY_RE
+
+
+@pytest.mark.parametrize("sql", ["SELECT 1", "select 1;", "  SELECT\n1 ; "])
+def test_test_query_matches_only_select_1(sql):
+    assert _TEST_QUERY_RE.fullmatch(sql)
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 1 AS flag, name FROM customers",
+    "SELECT name FROM customers WHERE EXISTS (SELECT 1 FROM orders)",
+    "SELECT 1.5",
+    "SELECT 10",
+    "SELECT 1 FROM customers",
+])
+def test_test_query_ignores_real_queries(sql):
+    assert not _TEST_QUERY_RE.fullmatch(sql)
+
+
+@pytest.mark.parametrize("sql, allowed", [
+    ("SELECT * FROM customers", True),
+    ("  select * from customers", True),
+    ("SELECTED", False),
+    ("DELETE FROM customers", False),
+    ("UPDATE customers SET a = 1", False),
+])
+def test_select_re(sql, allowed):
+    assert bool(_SELECT_RE.match(sql)) is allowed